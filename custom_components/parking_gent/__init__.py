@@ -1,48 +1,85 @@
 """The Parking Gent integration."""
 
-import asyncio
 import logging
-import requests
+import time
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
-from .constants import API_PARKING, API_PR, API_TIMEOUT
+from .constants import DOMAIN
+from .coordinator import ParkingGentCoordinator
+from .services import async_setup_services
+from .storage import ParkingGentStore
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Parking Gent services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Parking Gent from a config entry."""
+    """Set up Parking Gent from a config entry.
+    
+    Setup does no network I/O: the platforms are forwarded right away and
+    the first refresh runs in the background, so startup does not wait for
+    the API. Until it completes, the last stored data is served, if any.
+    """
+    start = time.perf_counter()
     
-    # Test API connectivity before setting up platforms
-    session = async_get_clientsession(hass)
+    store = ParkingGentStore(hass, entry.entry_id)
+    snapshot = await store.async_load()
     
-    try:
-        await _test_api_connectivity(hass, session)
-    except Exception as err:
-        _LOGGER.error("Failed to connect to Parking Gent API during setup: %s", err)
-        raise ConfigEntryNotReady(f"Unable to connect to Parking Gent API: {err}") from err
+    # One coordinator polls the APIs for the entities of every platform
+    coordinator = ParkingGentCoordinator(
+        hass, entry.data.get("selected_parkings", []), store
+    )
+    if snapshot:
+        # Come up with the last known (stale) data
+        coordinator.async_restore_snapshot(snapshot)
     
-    # Store the session for use by platforms
-    hass.data.setdefault("parking_gent", {})
-    hass.data["parking_gent"][entry.entry_id] = {
-        "session": session,
+    # Store the coordinator for use by platforms and services
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = {
+        "coordinator": coordinator,
     }
     
+    entry.async_create_background_task(
+        hass, _async_first_refresh(coordinator, start), "parking_gent_refresh"
+    )
+    
     # Forward the setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
     # Set up listener for config entry updates
     entry.async_on_unload(entry.add_update_listener(async_update_listener))
     
+    coordinator.metrics.setup_time = (time.perf_counter() - start) * 1000
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Set up in %.1f ms", coordinator.metrics.setup_time)
     return True
 
 
+async def _async_first_refresh(coordinator: ParkingGentCoordinator, start: float) -> None:
+    """Fetch the first live data and record how long after the setup started it came."""
+    await coordinator.async_refresh()
+    coordinator.metrics.first_refresh_time = (time.perf_counter() - start) * 1000
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "First refresh completed %.1f ms after setup started",
+            coordinator.metrics.first_refresh_time,
+        )
+
+
 async def async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle config entry updates."""
     _LOGGER.debug("Config entry updated, reloading integration")
@@ -54,65 +91,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data["parking_gent"].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(entry.entry_id)
     
     return unload_ok
 
 
-async def _test_api_connectivity(hass: HomeAssistant, session) -> None:
-    """Test connectivity to all parking APIs."""
-    # Only test currently enabled APIs - P+R API temporarily disabled due to 404 errors
-    apis_to_test = [
-        ("Parking Garages", API_PARKING),
-        # P+R API temporarily disabled due to 404 errors from City of Gent
-        # ("P+R Parking", API_PR),
-    ]
-    
-    errors = []
-    
-    for api_name, api_url in apis_to_test:
-        try:
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug("Testing connectivity to %s API: %s", api_name, api_url)
-            
-            # Use executor job for requests since we don't have aiohttp session yet
-            response = await hass.async_add_executor_job(
-                lambda: requests.get(api_url, timeout=API_TIMEOUT)
-            )
-            response.raise_for_status()
-            
-            # Check if response has expected structure
-            data = response.json()
-            if "results" not in data:
-                raise ValueError(f"API response missing 'results' field")
-            
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug("Successfully connected to %s API", api_name)
-            
-        except requests.exceptions.RequestException as err:
-            error_msg = f"Failed to connect to {api_name} API: {err}"
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(error_msg)
-            errors.append(error_msg)
-        except ValueError as err:
-            error_msg = f"Invalid response from {api_name} API: {err}"
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(error_msg)
-            errors.append(error_msg)
-        except Exception as err:
-            error_msg = f"Unexpected error with {api_name} API: {err}"
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(error_msg)
-            errors.append(error_msg)
-    
-    # If all APIs failed, raise an exception
-    if len(errors) == len(apis_to_test):
-        raise ConnectionError(f"All parking APIs are unavailable: {'; '.join(errors)}")
-    
-    # If some APIs failed, log warnings but continue
-    if errors:
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            _LOGGER.debug(
-                "Some parking APIs are unavailable, but continuing with available ones: %s",
-                "; ".join(errors)
-            )
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+    await ParkingGentStore(hass, entry.entry_id).async_remove()
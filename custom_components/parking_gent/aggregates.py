@@ -0,0 +1,98 @@
+"""Capacity totals over groups of parkings."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .models import ParkingRecord
+
+
+class CapacityTotals:
+    """Running totals of the capacity of a group of parkings.
+
+    Totals are maintained incrementally: a changed parking removes its
+    previous record and adds its new one, so a refresh costs O(changes)
+    instead of a pass over every parking.
+    """
+
+    __slots__ = ("available", "total", "open_count", "parkings")
+
+    def __init__(
+        self,
+        available: int = 0,
+        total: int = 0,
+        open_count: int = 0,
+        parkings: int = 0,
+    ) -> None:
+        """Initialize the totals."""
+        self.available = available
+        self.total = total
+        self.open_count = open_count
+        self.parkings = parkings
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the totals."""
+        if not isinstance(other, CapacityTotals):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        """Return a readable representation of the totals."""
+        return (
+            f"{type(self).__name__}(available={self.available}, total={self.total}, "
+            f"open_count={self.open_count}, parkings={self.parkings})"
+        )
+
+    def as_tuple(self) -> tuple[int, int, int, int]:
+        """Return the totals as a tuple."""
+        return self.available, self.total, self.open_count, self.parkings
+
+    @property
+    def occupancy(self) -> float | None:
+        """Return the occupied percentage of the total capacity."""
+        if self.total <= 0:
+            return None
+        return 100 * (self.total - self.available) / self.total
+
+    def add(self, record: ParkingRecord) -> None:
+        """Add the capacity of a parking."""
+        self.available += record.available_capacity
+        self.total += record.total_capacity
+        self.open_count += record.is_open_now
+        self.parkings += 1
+
+    def remove(self, record: ParkingRecord) -> None:
+        """Remove the capacity of a parking added before."""
+        self.available -= record.available_capacity
+        self.total -= record.total_capacity
+        self.open_count -= record.is_open_now
+        self.parkings -= 1
+
+    @classmethod
+    def combine(cls, totals: Iterable[CapacityTotals]) -> CapacityTotals:
+        """Return the sum of several totals."""
+        combined = cls()
+        for part in totals:
+            combined.available += part.available
+            combined.total += part.total
+            combined.open_count += part.open_count
+            combined.parkings += part.parkings
+        return combined
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[Mapping[str, Any]], open_field: str) -> CapacityTotals:
+        """Create totals from the rows of an ODS aggregation query.
+
+        Each row holds the "available", "total" and "parkings" sums of the
+        parkings sharing one value of open_field.
+        """
+        totals = cls()
+        for group in groups:
+            parkings = int(group.get("parkings") or 0)
+            totals.available += int(group.get("available") or 0)
+            totals.total += int(group.get("total") or 0)
+            totals.parkings += parkings
+            if group.get(open_field):
+                totals.open_count += parkings
+        return totals
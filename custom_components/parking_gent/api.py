@@ -0,0 +1,355 @@
+"""Async HTTP client for the Stad Gent open data API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import aiohttp
+from aiohttp import hdrs
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .constants import (
+    API_CONNECT_TIMEOUT,
+    API_MAX_OFFSET,
+    API_PAGE_SIZE,
+    API_TIMEOUT,
+    CATALOG_CACHE_TTL,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_API_CLIENT = "api_client"
+
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+@dataclass
+class RequestTiming:
+    """Phases of a single request, in milliseconds.
+
+    dns and connect stay None when a pooled connection was reused.
+    """
+
+    dns: float | None = None
+    connect: float | None = None
+    ttfb: float | None = None
+    total: float | None = None
+    decode: float = 0.0
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a (conditional) request to the API."""
+
+    payload: dict[str, Any] | None
+    etag: str | None
+    last_modified: str | None
+    size: int
+    timing: RequestTiming | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Return True when the server answered 304 Not Modified."""
+        return self.payload is None
+
+
+@dataclass
+class CatalogEntry:
+    """All records of a source, as cached by the client."""
+
+    fetched_at: float
+    records: list[dict[str, Any]]
+    etag: str | None
+    last_modified: str | None
+
+
+def _elapsed_ms(start: float) -> float:
+    """Return the milliseconds since a time.perf_counter() reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config timing the requests that carry a RequestTiming.
+
+    The RequestTiming is passed as trace_request_ctx; the start of every
+    phase is kept on the per-request trace context.
+    """
+
+    async def on_request_start(session, context, params) -> None:
+        context.start = time.perf_counter()
+
+    async def on_dns_resolvehost_start(session, context, params) -> None:
+        context.dns_start = time.perf_counter()
+
+    async def on_dns_resolvehost_end(session, context, params) -> None:
+        if isinstance(context.trace_request_ctx, RequestTiming):
+            context.trace_request_ctx.dns = _elapsed_ms(context.dns_start)
+
+    async def on_connection_create_start(session, context, params) -> None:
+        context.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, context, params) -> None:
+        if isinstance(context.trace_request_ctx, RequestTiming):
+            # Includes DNS resolution and the TLS handshake
+            context.trace_request_ctx.connect = _elapsed_ms(context.connect_start)
+
+    async def on_request_end(session, context, params) -> None:
+        # Fired once the response headers are received
+        if isinstance(context.trace_request_ctx, RequestTiming):
+            context.trace_request_ctx.ttfb = _elapsed_ms(context.start)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+def page_url(url: str, offset: int, limit: int = API_PAGE_SIZE) -> str:
+    """Return a records URL for the page starting at offset."""
+    parts = urlsplit(url)
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in ("limit", "offset")
+    ]
+    query += [("limit", str(limit)), ("offset", str(offset))]
+    return urlunsplit(parts._replace(query=urlencode(query, quote_via=quote)))
+
+
+class RecordStream:
+    """Iterate over the records of a paginated ODS records endpoint.
+
+    Pages are requested one at a time by following total_count, and each page
+    is released as soon as its records are consumed, so memory stays bounded
+    by the page size whatever the size of the dataset.
+
+    The validators of the first page only cover that page, so they are only
+    kept to revalidate the records when all of them fit on a single page.
+    """
+
+    def __init__(
+        self,
+        client: ParkingGentApiClient,
+        url: str,
+        first_page: FetchResult,
+        timeout: float = API_TIMEOUT,
+    ) -> None:
+        """Initialize the stream from the already fetched first page."""
+        self._client = client
+        self._url = url
+        self._first_page = first_page
+        self._timeout = timeout
+        self._etag = first_page.etag
+        self._last_modified = first_page.last_modified
+        self.total_count = 0
+        self.received = 0
+        self.pages = 0
+        self.size = 0
+        self.timings = [first_page.timing] if first_page.timing else []
+        # Milliseconds spent waiting for the pages after the first one
+        self.wait_time = 0.0
+
+    @property
+    def etag(self) -> str | None:
+        """Return the ETag to revalidate the records with, None after several pages."""
+        return self._etag if self.pages == 1 else None
+
+    @property
+    def last_modified(self) -> str | None:
+        """Return the Last-Modified to revalidate the records with, None after several pages."""
+        return self._last_modified if self.pages == 1 else None
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield the records of every page."""
+        page = self._first_page
+        self._first_page = None
+        self.total_count = page.payload.get("total_count", 0)
+
+        while True:
+            results = page.payload.get("results")
+            if results is None:
+                raise ValueError("API response missing 'results' field")
+            self.pages += 1
+            self.size += page.size
+            self.received += len(results)
+            page = None
+
+            for record in results:
+                yield record
+
+            if not results or self.received >= self.total_count:
+                return
+            if self.received + API_PAGE_SIZE > API_MAX_OFFSET:
+                _LOGGER.warning(
+                    "Dataset has %d records, only the first %d can be paged: %s",
+                    self.total_count,
+                    self.received,
+                    self._url,
+                )
+                return
+
+            start = time.perf_counter()
+            page = await self._client.async_fetch(
+                page_url(self._url, self.received), timeout=self._timeout
+            )
+            self.wait_time += _elapsed_ms(start)
+            if page.timing:
+                self.timings.append(page.timing)
+
+
+class ParkingGentApiClient:
+    """Fetch payloads from the Stad Gent API over a shared aiohttp session.
+
+    The session is a pooled Home Assistant client session, so consecutive
+    polls reuse keep-alive connections instead of doing a new TLS handshake.
+    When it is created with create_trace_config(), every FetchResult carries
+    the timing of its request.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._catalogs: dict[str, CatalogEntry] = {}
+        self._inflight: dict[str, asyncio.Future[list[dict[str, Any]]]] = {}
+
+    async def async_fetch(
+        self,
+        url: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        timeout: float = API_TIMEOUT,
+    ) -> FetchResult:
+        """Fetch an URL, sending the given validators as conditional headers.
+
+        A 304 response is returned without reading or decoding a body, with
+        the validators that were sent so they stay valid for the next poll.
+        """
+        headers = {hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING}
+        if etag:
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Requesting %s", url)
+
+        timing = RequestTiming()
+        start = time.perf_counter()
+        async with self._session.get(
+            url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(
+                total=timeout, connect=min(timeout, API_CONNECT_TIMEOUT)
+            ),
+            trace_request_ctx=timing,
+        ) as response:
+            if response.status == 304:
+                timing.total = _elapsed_ms(start)
+                return FetchResult(None, etag, last_modified, 0, timing)
+
+            response.raise_for_status()
+            body = await response.read()
+            timing.total = _elapsed_ms(start)
+            decode_start = time.perf_counter()
+            payload = json.loads(body)
+            timing.decode = _elapsed_ms(decode_start)
+            return FetchResult(
+                payload,
+                response.headers.get(hdrs.ETAG),
+                response.headers.get(hdrs.LAST_MODIFIED),
+                # Content-Length is the size on the wire, before decompression
+                response.content_length or len(body),
+                timing,
+            )
+
+    def get_cached_catalog(self, url: str) -> list[dict[str, Any]] | None:
+        """Return the cached records of a source if they are still fresh."""
+        entry = self._catalogs.get(url)
+        if entry is None or time.monotonic() - entry.fetched_at > CATALOG_CACHE_TTL:
+            return None
+        return entry.records
+
+    async def async_get_catalog(
+        self, url: str, timeout: float = API_TIMEOUT
+    ) -> list[dict[str, Any]]:
+        """Return all records of a source, shared between concurrent callers.
+
+        Records are served from memory for CATALOG_CACHE_TTL seconds. Callers
+        arriving while a download is in flight await that same download, and
+        an expired entry is revalidated with a conditional request.
+        """
+        if (records := self.get_cached_catalog(url)) is not None:
+            return records
+
+        if (future := self._inflight.get(url)) is None:
+            future = asyncio.ensure_future(self._async_fetch_catalog(url, timeout))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(future)
+
+    async def _async_fetch_catalog(
+        self, url: str, timeout: float
+    ) -> list[dict[str, Any]]:
+        """Download (or revalidate) every record of a source into the cache."""
+        entry = self._catalogs.get(url)
+        first_page = await self.async_fetch(
+            url,
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None,
+            timeout=timeout,
+        )
+        if first_page.not_modified and entry is not None:
+            entry.fetched_at = time.monotonic()
+            return entry.records
+
+        records = self.stream_records(url, first_page, timeout)
+        self._catalogs[url] = CatalogEntry(
+            time.monotonic(),
+            [record async for record in records],
+            records.etag,
+            records.last_modified,
+        )
+        return self._catalogs[url].records
+
+    def stream_records(
+        self, url: str, first_page: FetchResult, timeout: float = API_TIMEOUT
+    ) -> RecordStream:
+        """Return a stream over all records, starting from a fetched page."""
+        return RecordStream(self, url, first_page, timeout)
+
+
+def async_get_api_client(hass: HomeAssistant) -> ParkingGentApiClient:
+    """Return the API client shared by all Parking Gent config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    client = domain_data.get(DATA_API_CLIENT)
+    if client is None:
+        # Created with auto_cleanup, the session would close with the config
+        # entry being set up, while the client is shared by every entry
+        session = async_create_clientsession(
+            hass, auto_cleanup=False, trace_configs=[create_trace_config()]
+        )
+
+        @callback
+        def async_detach_session(event: Event) -> None:
+            # The connector is shared with Home Assistant, which closes it
+            session.detach()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_detach_session)
+        client = ParkingGentApiClient(session)
+        domain_data[DATA_API_CLIENT] = client
+    return client
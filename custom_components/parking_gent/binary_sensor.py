@@ -0,0 +1,50 @@
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .constants import DOMAIN
+from .entity import ParkingEntity, async_add_parking_entities
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Parking Gent binary sensor platform."""
+    
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
+    
+    async_add_parking_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda parking_id: [ParkingOpenBinarySensor(coordinator, parking_id)],
+    )
+
+
+class ParkingOpenBinarySensor(ParkingEntity, BinarySensorEntity):
+    """Whether a parking is open now."""
+
+    _attr_device_class = BinarySensorDeviceClass.OPENING
+
+    def __init__(self, coordinator, parking_id):
+        """Initialize the binary sensor."""
+        self._attr_icon = "mdi:garage-open-variant"
+        self._attr_unique_id = f"parking_{parking_id.lower().replace(' ', '_')}_open"
+        self._attr_name = f"{parking_id} open"
+        super().__init__(coordinator, parking_id)
+
+    def _update_from_snapshot(self) -> None:
+        """Take the opening state of the current snapshot."""
+        data = self.coordinator.data
+        record = data.get(self.parking_id) if data else None
+        self._attr_is_on = record.is_open_now if record is not None else None
@@ -0,0 +1,79 @@
+"""Circuit breaker guarding the individual Parking Gent APIs."""
+
+from __future__ import annotations
+
+import logging
+import random
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .constants import API_RETRY_DELAY, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+BREAKER_STATES = [STATE_CLOSED, STATE_OPEN, STATE_HALF_OPEN]
+
+# Random spread applied to every backoff delay
+BACKOFF_JITTER = 0.2
+
+
+class CircuitBreaker:
+    """Stop polling an API that keeps failing until a probe succeeds.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the breaker opens and
+    no requests are sent for a jittered, exponentially growing delay starting
+    at API_RETRY_DELAY. Once the delay passed a single probe request is let
+    through (half-open): success closes the breaker, failure reopens it with
+    a longer delay.
+    """
+
+    def __init__(self, name: str) -> None:
+        """Initialize the breaker in the closed state."""
+        self.name = name
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at: datetime | None = None
+        self.last_error: str | None = None
+
+    def allow_request(self) -> bool:
+        """Return True when a request may be sent to the API now."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and dt_util.utcnow() >= self.retry_at:
+            # Let exactly one probe through until its outcome is recorded
+            self.state = STATE_HALF_OPEN
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Circuit breaker of %s API half-open, probing", self.name)
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if self.state != STATE_CLOSED and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Circuit breaker of %s API closed", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.retry_at = None
+        self.last_error = None
+
+    def record_failure(self, error: str) -> None:
+        """Count a failed request and open the breaker when needed."""
+        self.failures += 1
+        self.last_error = error
+        if self.state != STATE_HALF_OPEN and self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+
+        exponent = self.failures - BREAKER_FAILURE_THRESHOLD
+        delay = min(API_RETRY_DELAY * 2 ** min(max(exponent, 0), 16), BREAKER_MAX_DELAY)
+        delay *= random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+        self.state = STATE_OPEN
+        self.retry_at = dt_util.utcnow() + timedelta(seconds=delay)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Circuit breaker of %s API opened for %.0fs after %d failures",
+                self.name, delay, self.failures
+            )
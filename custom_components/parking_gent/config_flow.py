@@ -4,7 +4,6 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import requests
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -13,7 +12,9 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.selector import SelectSelector, SelectSelectorConfig, SelectSelectorMode
 
-from .constants import API_PARKING, API_PR, API_TIMEOUT, FIELDS_GARAGE, FIELDS_PR
+from .api import async_get_api_client
+from .constants import DOMAIN
+from .sources import SOURCES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,40 +28,26 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
 
 
 async def get_available_parkings(hass: HomeAssistant) -> dict[str, list[str]]:
-    """Get all available parking locations from APIs."""
-    # Temporarily using only working APIs - P+R API disabled due to 404 errors
-    apis_to_check = [
-        ("Parking Garages", API_PARKING, FIELDS_GARAGE),
-        # P+R API temporarily disabled due to 404 errors from City of Gent
-        # ("P+R Parking", API_PR, FIELDS_PR),
-    ]
-    
+    """Get all available parking locations from the enabled APIs."""
+    client = async_get_api_client(hass)
     available_parkings = {}
     
-    for api_name, api_url, fields in apis_to_check:
-        try:
-            response = await hass.async_add_executor_job(
-                lambda: requests.get(api_url, timeout=API_TIMEOUT)
-            )
-            response.raise_for_status()
-            
-            api_data = response.json()
-            if "results" not in api_data:
-                continue
-            
-            parkings = []
-            for record in api_data.get("results", []):
-                name = record.get(fields["name"])
-                if name:
-                    parkings.append(name)
-            
-            if parkings:
-                available_parkings[api_name] = sorted(parkings)
-                _LOGGER.debug("Found %d parkings in %s API", len(parkings), api_name)
-            
-        except Exception as err:
-            _LOGGER.debug("Failed to fetch parkings from %s API: %s", api_name, err)
+    async def fetch_names(source):
+        return [
+            name
+            for record in await client.async_get_catalog(source.url)
+            if (name := record.get(source.mapping["name"]))
+        ]
+    
+    results = await SOURCES.async_gather(fetch_names)
+    for source, parkings in zip(SOURCES.enabled, results):
+        if isinstance(parkings, BaseException):
+            _LOGGER.debug("Failed to fetch parkings from %s API: %s", source.name, parkings)
             continue
+        
+        if parkings:
+            available_parkings[source.name] = sorted(parkings)
+            _LOGGER.debug("Found %d parkings in %s API", len(parkings), source.name)
     
     return available_parkings
 
@@ -87,7 +74,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     }
 
 
-class ConfigFlow(config_entries.ConfigFlow, domain="parking_gent"):
+class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Parking Gent."""
 
     VERSION = 1
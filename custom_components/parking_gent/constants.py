@@ -1,12 +1,17 @@
+import os
 from datetime import timedelta
+from urllib.parse import quote
+
+DOMAIN = "parking_gent"
 
 # Constants for API configurations
-BASE_API_URL = "https://data.stad.gent/api/explore"
+# Can be pointed at a stand-in server, like tests/ods_server.py, for offline testing
+BASE_API_URL = os.environ.get("PARKING_GENT_API_URL", "https://data.stad.gent/api/explore")
 API_VERSION = "v2.1"
 
 DATASET_GARAGE = "bezetting-parkeergarages-real-time"
 DATASET_PR = "real-time-bezetting-pr-gent"
-# DATASET_MOBI = "mobi-parkings"
+DATASET_MOBI = "mobi-parkings"
 
 FIELDS_GARAGE = {
     "availableCapacity": "availablecapacity",
@@ -32,29 +37,76 @@ FIELDS_PR = {
     "url": "urllinkaddress",
 }
 
-# FIELDS_MOBI = {
-#     "availableCapacity": "availablecapacity",
-#     "isOpenNow": "isopennow",
-#     "lastUpdate": "lastupdate",
-#     "location": "location",
-#     "name": "id_parking",
-#     "occupation": "occupation",
-#     "openingTimes": "openingtimesdescription",
-#     "totalCapacity": "totalcapacity",
-#     "url": "urllinkaddress",
-# }
-
-# PARKING_SELECT_MOBI = [
-#     "Interparking Zuid",
-#     "Interparking Kouter",
-#     "Interparking Center",
-# ]
+FIELDS_MOBI = {
+    "availableCapacity": "availablecapacity",
+    "isOpenNow": "isopennow",
+    "lastUpdate": "lastupdate",
+    "location": "location",
+    "name": "id_parking",
+    "occupation": "occupation",
+    "openingTimes": "openingtimesdescription",
+    "totalCapacity": "totalcapacity",
+    "url": "urllinkaddress",
+}
+
+# Fields polled every refresh, the others rarely change and are fetched as metadata
+DYNAMIC_FIELDS = ("name", "availableCapacity", "isOpenNow", "lastUpdate", "occupation")
+METADATA_REFRESH_INTERVAL = timedelta(days=1)
+
+PARKING_SELECT_MOBI = [
+    "Interparking Zuid",
+    "Interparking Kouter",
+    "Interparking Center",
+]
 
 SCAN_INTERVAL = timedelta(minutes=5)
 
+# Concurrent requests to the parking sources, across all datasets
+SOURCE_CONCURRENCY = 4
+
+# Bounds and tuning of the adaptive polling scheduler
+MIN_SCAN_INTERVAL = timedelta(minutes=1)
+MAX_SCAN_INTERVAL = timedelta(minutes=30)
+PUBLISH_GRACE = timedelta(seconds=30)  # poll this long after an expected publish
+NEAR_CAPACITY_OCCUPATION = 90  # occupation percentage that tightens polling
+
+# Occupancy history kept per parking for the trend sensors
+HISTORY_SIZE = 96  # published samples per parking
+RATE_SAMPLES = 6  # samples spanned by the fill rate
+
+# Weekday x time-of-day occupancy forecast
+FORECAST_SLOT_MINUTES = 15  # width of a time-of-day slot of the model
+FORECAST_LEARNING_RATE = 0.1  # weight of a new sample once a slot has enough history
+FORECAST_HORIZON_MINUTES = 30  # horizon of the predicted availability sensors
+
+# Cell size of the spatial index of the parking locations, about 1 km
+GRID_CELL_DEGREES = 0.01
+
 # Timeout settings for API requests
 API_TIMEOUT = 30
+API_CONNECT_TIMEOUT = 10
+API_SOURCE_TIMEOUT = 15  # per-source timeout during a coordinator update
+UPDATE_CYCLE_DEADLINE = 20  # seconds before slow sources are dropped from a cycle
 API_RETRY_DELAY = 60  # seconds to wait before retrying failed APIs
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before an API is skipped
+BREAKER_MAX_DELAY = 3600  # upper bound of the retry backoff in seconds
+
+# Seconds a downloaded catalog is shared by setup, config flow and first refresh
+CATALOG_CACHE_TTL = 120
+
+# Values kept per pipeline metric for the rolling percentiles (about 8 hours of polls)
+METRICS_WINDOW = 100
+
+# Lines of the profile report per cProfile and tracemalloc listing
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_ALLOCATIONS = 25
+
+# ODS returns at most 100 records per page and refuses offsets beyond 10000
+API_PAGE_SIZE = 100
+API_MAX_OFFSET = 10000
+
+# Longest where-clause pushed to the API, larger selections are filtered locally
+MAX_WHERE_LENGTH = 1500
 
 
 def compose_select(mapping):
@@ -65,6 +117,31 @@ def join_array(elements):
     return ",".join([f'"{element}"' for element in elements])
 
 
-API_PARKING = f"{BASE_API_URL}/{API_VERSION}/catalog/datasets/{DATASET_GARAGE}/records?select={compose_select(FIELDS_GARAGE)}&limit=100"
-API_PR = f"{BASE_API_URL}/{API_VERSION}/catalog/datasets/{DATASET_PR}/records?select={compose_select(FIELDS_PR)}&limit=100"
-# API_MOBI = f'{BASE_API_URL}/{API_VERSION}/catalog/datasets/{DATASET_MOBI}/records?select={compose_select(FIELDS_MOBI)}&where={FIELDS_MOBI["totalCapacity"]} > 0 and id_parking IN ({join_array(PARKING_SELECT_MOBI)})&limit=100'
+def compose_where_in(field, elements):
+    return f"{field} IN ({join_array(elements)})"
+
+
+def compose_records_url(dataset, mapping, where=None):
+    url = f"{BASE_API_URL}/{API_VERSION}/catalog/datasets/{dataset}/records?select={compose_select(mapping)}"
+    if where:
+        url += f"&where={quote(where)}"
+    return f"{url}&limit={API_PAGE_SIZE}"
+
+
+def compose_aggregate_url(dataset, mapping, where=None):
+    select = (
+        f"sum({mapping['availableCapacity']}) as available,"
+        f"sum({mapping['totalCapacity']}) as total,"
+        "count(*) as parkings"
+    )
+    url = (
+        f"{BASE_API_URL}/{API_VERSION}/catalog/datasets/{dataset}/records"
+        f"?select={quote(select)}&group_by={mapping['isOpenNow']}"
+    )
+    if where:
+        url += f"&where={quote(where)}"
+    return url
+
+
+API_PARKING = compose_records_url(DATASET_GARAGE, FIELDS_GARAGE)
+API_PR = compose_records_url(DATASET_PR, FIELDS_PR)
@@ -0,0 +1,847 @@
+"""Data update coordinator shared by the Parking Gent platforms."""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .aggregates import CapacityTotals
+from .api import async_get_api_client
+from .breaker import CircuitBreaker
+from .history import OccupancyHistory
+from .metrics import METRICS_CYCLE, METRICS_LISTENER, FetchMetrics
+from .models import parse_last_update
+from .normalizer import compile_normalizer, missing_fields
+from .scheduler import AdaptivePollScheduler
+from .sources import SOURCES
+from .constants import (
+    FORECAST_HORIZON_MINUTES,
+    MAX_WHERE_LENGTH,
+    METADATA_REFRESH_INTERVAL,
+    SCAN_INTERVAL,
+    API_SOURCE_TIMEOUT,
+    UPDATE_CYCLE_DEADLINE,
+    compose_aggregate_url,
+    compose_records_url,
+    compose_where_in,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Scope of the aggregate sensors summing every API
+AGGREGATE_CITY = "city"
+# Listener context of the aggregate sensors, updated on their own when the
+# totals fetched from the server come in
+AGGREGATES_LISTENER = "aggregates"
+
+
+class ParkingGentCoordinator(DataUpdateCoordinator):
+    """Fetch and normalize parking data from Stad Gent API."""
+
+    def __init__(self, hass, selected_parkings=None, store=None):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Parking Gent",
+            update_interval=SCAN_INTERVAL,
+        )
+        self.hass = hass
+        self.selected_parkings = set(selected_parkings or [])
+        self._sources = SOURCES.enabled
+        self._cycle = 0
+        # Polls select the dynamic fields only, the metadata requests every field
+        self._api_urls = {
+            source.name: self._build_api_url(source, source.poll_mapping)
+            for source in self._sources
+        }
+        self._metadata_urls = {
+            source.name: self._build_api_url(source, source.mapping)
+            for source in self._sources
+        }
+        self._metadata = {}
+        self._metadata_fetched = {}
+        self._client = async_get_api_client(hass)
+        self._store = store
+        self.stale = False
+        self._last_successful_data = {}
+        self._source_data = {}
+        self._normalizers = {
+            source.name: compile_normalizer(source.mapping)
+            for source in self._sources
+        }
+        self._scheduler = AdaptivePollScheduler()
+        self.breakers = {
+            source.name: CircuitBreaker(source.name)
+            for source in self._sources
+        }
+        self.data_version = 0
+        # The parkings changed by the running cycle; one cycle runs at a time,
+        # so the set is not cleared by another before the listeners saw it
+        self.changed_parkings = set()
+        self._update_lock = asyncio.Lock()
+        self.attributes = {}
+        self.histories = {}
+        # numpy is imported with the forecast model, on first use in the executor
+        self.forecaster = None
+        self._forecast_state = None
+        self._forecaster_lock = threading.Lock()
+        self.forecasts = {}
+        # The index is rebuilt once the data carries a new set of locations;
+        # its module imports numpy, so it is imported in the executor
+        self._spatial = None
+        self._spatial_index = None
+        self._spatial_index_version = 0
+        self._locations_version = 0
+        # Totals of all parkings per source: computed from the diffs when every
+        # record is fetched, queried from the server when only the selection is
+        self._aggregate_urls = {
+            source.name: compose_aggregate_url(
+                source.dataset, source.mapping, source.where
+            )
+            for source in self._sources
+        } if self.selected_parkings else {}
+        self._local_totals = {
+            source.name: CapacityTotals() for source in self._sources
+        }
+        self._remote_totals = {}
+        self._totals_validators = {}
+        self._totals_tasks = {}
+        self._parking_sources = {}
+        self.aggregates = {}
+        self._validators = {}
+        self._payload_sizes = {}
+        self.fetch_stats = {
+            "requests": 0,
+            "not_modified": 0,
+            "bytes_received": 0,
+            "bytes_saved": 0,
+            "parse_cycles_saved": 0,
+        }
+        self.metrics = FetchMetrics()
+        self.profiler = None
+
+    async def _async_refresh(self, *args, **kwargs):
+        """Refresh and update the listeners, profiling the cycle when requested.
+
+        One refresh runs at a time: an overlapping one, from a service call
+        say, waits until the running cycle has updated its listeners, so no
+        cycle clears the changes of another and profiled cycles do not nest.
+        """
+        async with self._update_lock:
+            profiler = self.profiler
+            if profiler is None or profiler.finished or not profiler.start_cycle():
+                await super()._async_refresh(*args, **kwargs)
+                return
+            try:
+                await super()._async_refresh(*args, **kwargs)
+            finally:
+                profiler.end_cycle()
+
+    async def _async_update_data(self):
+        """Fetch and normalize data from all APIs, timing the cycle."""
+        start = time.perf_counter()
+        # Only the states written by this cycle are counted
+        self.metrics.pending_state_writes = 0
+        try:
+            return await self._async_update_sources()
+        finally:
+            self.metrics.cycles += 1
+            self.metrics.record(
+                METRICS_CYCLE, "duration", (time.perf_counter() - start) * 1000
+            )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, counting the parking states they write.
+
+        The metric sensors are updated last, once the writes are recorded.
+        """
+        self._async_update_entities()
+        self.metrics.record(
+            METRICS_CYCLE, "state_writes", self.metrics.pending_state_writes
+        )
+        self.metrics.pending_state_writes = 0
+        for update_callback, context in list(self._listeners.values()):
+            if context == METRICS_LISTENER:
+                update_callback()
+
+    @callback
+    def _async_update_entities(self) -> None:
+        """Update the listeners other than the metric sensors."""
+        for update_callback, context in list(self._listeners.values()):
+            if context != METRICS_LISTENER:
+                update_callback()
+
+    async def _async_update_sources(self):
+        """Fetch and normalize data from all APIs concurrently.
+
+        Every completed source is pushed to the entities right away, so a
+        slow source does not hold back the others until the cycle ends.
+        """
+        self.changed_parkings = set()
+        data = {}
+        failed_apis = []
+        fresh_sources = 0
+        # Parkings and history samples already published during this cycle
+        published = set()
+        samples = []
+        
+        self._cycle += 1
+        tasks = {}
+        for source in self._sources:
+            if self._cycle % source.poll_cost and source.name in self._source_data:
+                # Expensive source, not due this refresh
+                data.update(self._source_data[source.name])
+                continue
+            if self.breakers[source.name].allow_request():
+                tasks[asyncio.create_task(self._async_fetch_source(source))] = source
+                if source.name in self._aggregate_urls:
+                    self._async_start_totals(source)
+            else:
+                # Open circuit: skip the request and keep the last known data
+                failed_apis.append(f"{source.name} API skipped, circuit open")
+                data.update(self._source_data.get(source.name, {}))
+        pending = set(tasks)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + UPDATE_CYCLE_DEADLINE
+        
+        # Merge every source as soon as it completes, until the cycle deadline
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            completed = fresh_sources
+            for task in done:
+                source = tasks[task]
+                source_data, error_msg = task.result()
+                self.metrics.record_outcome(source.name, error_msg)
+                if error_msg is None:
+                    self.breakers[source.name].record_success()
+                    self._source_data[source.name] = source_data
+                    self._scheduler.observe(source.name, source_data.values())
+                    data.update(source_data)
+                    fresh_sources += 1
+                else:
+                    self.breakers[source.name].record_failure(error_msg)
+                    failed_apis.append(error_msg)
+                    data.update(self._source_data.get(source.name, {}))
+            if pending and fresh_sources > completed:
+                samples.extend(
+                    self._async_publish_partial(data, [tasks[task] for task in pending])
+                )
+                published.update(self.changed_parkings)
+        
+        # Sources that missed the deadline keep their last known data
+        for task in pending:
+            task.cancel()
+            source = tasks[task]
+            error_msg = f"{source.name} API did not respond within {UPDATE_CYCLE_DEADLINE}s"
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(error_msg)
+            self.breakers[source.name].record_failure(error_msg)
+            self.metrics.record_outcome(source.name, error_msg)
+            failed_apis.append(error_msg)
+            data.update(self._source_data.get(source.name, {}))
+        
+        # If we got some data, update our successful data cache
+        if fresh_sources and data:
+            self._last_successful_data = data
+            self._diff_snapshot(data)
+            if self.stale:
+                # Restored data is live again, every sensor drops its stale flag
+                self.stale = False
+                self.changed_parkings.update(data)
+            self._update_totals(data)
+            self._update_attributes(data)
+            # Published along with the attributes, the locations version always
+            # describes self.data, also while the forecasts are computed
+            self.data = data
+            samples.extend(self._update_histories(data))
+            self.forecasts = await self.hass.async_add_executor_job(
+                self._train_and_predict, samples, data
+            )
+            if (published or self.changed_parkings) and self._store is not None:
+                self._store.async_schedule_save(
+                    self._source_data,
+                    self.histories,
+                    self.forecaster,
+                    self._metadata_fetched,
+                    self._remote_totals,
+                )
+            self.update_interval = self._scheduler.next_interval(data)
+            if failed_apis and _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Partial data update successful (%d parking locations). Failed APIs: %s",
+                    len(data), "; ".join(failed_apis)
+                )
+            elif _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Full data update successful (%d parking locations)", len(data))
+            return data
+        
+        # No source was due this refresh, nothing changed
+        if self._last_successful_data and not tasks and not failed_apis:
+            return self._last_successful_data
+        
+        # If no new data but we have cached data, use that with a warning
+        if self._last_successful_data:
+            _LOGGER.warning(
+                "All APIs failed, using cached data (%d parking locations)",
+                len(self._last_successful_data)
+            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("API errors: %s", "; ".join(failed_apis))
+            return self._last_successful_data
+        
+        # If no data at all, raise UpdateFailed
+        error_msg = f"All parking APIs failed and no cached data available"
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            error_msg += f": {'; '.join(failed_apis)}"
+        _LOGGER.error(error_msg)
+        raise UpdateFailed(error_msg)
+
+    @callback
+    def async_restore_snapshot(self, snapshot) -> None:
+        """Serve stored data, marked stale, until the first live refresh."""
+        for api_name, records in snapshot["sources"].items():
+            if api_name not in self.breakers:
+                continue
+            self._source_data[api_name] = {
+                parking_id: record
+                for parking_id, record in records.items()
+                if not self.selected_parkings or parking_id in self.selected_parkings
+            }
+        data = {}
+        for records in self._source_data.values():
+            data.update(records)
+        if not data:
+            return
+        # The stored records carry the metadata they were merged with
+        for api_name, fetched in snapshot.get("metadata_fetched", {}).items():
+            if api_name in self._source_data:
+                self._metadata[api_name] = self._source_data[api_name]
+                self._metadata_fetched[api_name] = fetched
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Restored %d parking locations saved at %s",
+                len(data), snapshot["saved_at"]
+            )
+        self.histories.update(
+            (parking_id, history)
+            for parking_id, history in snapshot.get("histories", {}).items()
+            if parking_id in data
+        )
+        if snapshot.get("forecast"):
+            self._forecast_state = snapshot["forecast"]
+        # The totals of a selection are served until the server is queried again
+        self._remote_totals.update(
+            (api_name, totals)
+            for api_name, totals in snapshot.get("totals", {}).items()
+            if api_name in self._aggregate_urls
+        )
+        self.stale = True
+        self._last_successful_data = data
+        self._diff_snapshot(data)
+        self._update_totals(data)
+        self._update_attributes(data)
+        self.async_set_updated_data(data)
+
+    @callback
+    def _async_publish_partial(self, data, pending_sources):
+        """Push the sources completed so far to the entities.
+
+        The sources still being fetched keep their last known records. The
+        forecasts are only updated once the cycle completes. Returns the
+        history samples added by the changed parkings.
+        """
+        snapshot = dict(data)
+        for source in pending_sources:
+            snapshot.update(self._source_data.get(source.name, {}))
+        self._diff_snapshot(snapshot)
+        if self.stale:
+            self.stale = False
+            self.changed_parkings.update(snapshot)
+        if not self.changed_parkings:
+            return []
+        self._update_totals(snapshot)
+        self._update_attributes(snapshot)
+        samples = self._update_histories(snapshot)
+        self.data = snapshot
+        self._async_update_entities()
+        return samples
+
+    def _diff_snapshot(self, data) -> None:
+        """Record which parkings changed compared to the previous snapshot."""
+        previous = self.data or {}
+        self.changed_parkings = {
+            parking_id
+            for parking_id, record in data.items()
+            if record is not previous.get(parking_id)
+            and record != previous.get(parking_id)
+        }
+        self.changed_parkings.update(previous.keys() - data.keys())
+        if self.changed_parkings:
+            self.data_version += 1
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(
+                "Snapshot version %d, %d/%d parking locations changed",
+                self.data_version, len(self.changed_parkings), len(data)
+            )
+
+    def _update_totals(self, data) -> None:
+        """Apply the changed parkings to the totals of their source."""
+        if self._aggregate_urls:
+            # Only the selection is fetched, the server sums all parkings
+            self._set_aggregates(self._remote_totals)
+            return
+        previous = self.data or {}
+        for parking_id in self.changed_parkings:
+            record = previous.get(parking_id)
+            api_name = self._parking_sources.pop(parking_id, None)
+            if record is not None and api_name is not None:
+                self._local_totals[api_name].remove(record)
+            record = data.get(parking_id)
+            if record is None:
+                continue
+            for api_name, records in self._source_data.items():
+                if parking_id in records:
+                    self._parking_sources[parking_id] = api_name
+                    self._local_totals[api_name].add(record)
+                    break
+        self._set_aggregates(self._local_totals)
+
+    def _set_aggregates(self, totals) -> None:
+        """Publish the totals per API and their city-wide sum.
+
+        The city-wide sum is only published once the totals of every API are
+        known, a partial sum would look like a real value.
+        """
+        self.aggregates = {name: totals[name] for name in self.breakers if name in totals}
+        if len(self.aggregates) == len(self.breakers):
+            self.aggregates[AGGREGATE_CITY] = CapacityTotals.combine(self.aggregates.values())
+
+    def _update_attributes(self, data) -> None:
+        """Rebuild the state attributes of the changed parkings only.
+
+        Attribute dicts are built once per change and handed to the entities
+        as-is, so reading the state of a parking does no work at all.
+        """
+        for parking_id in self.changed_parkings:
+            record = data.get(parking_id)
+            previous = self.attributes.get(parking_id)
+            if record is None:
+                self.attributes.pop(parking_id, None)
+                self._locations_version += 1
+                continue
+            if (
+                previous is None
+                or previous["latitude"] != record.latitude
+                or previous["longitude"] != record.longitude
+            ):
+                # Only a changed set of locations invalidates the spatial index
+                self._locations_version += 1
+            self.attributes[parking_id] = {
+                "isOpenNow": record.is_open_now,
+                "lastUpdate": record.last_update,
+                "location": record.location,
+                "latitude": record.latitude,
+                "longitude": record.longitude,
+                "occupation": record.occupation,
+                "openingTimes": record.opening_times,
+                "totalCapacity": record.total_capacity,
+                "url": record.url,
+                "stale": self.stale,
+            }
+
+    def _update_histories(self, data):
+        """Add the newly published samples of the changed parkings.
+
+        Returns the accepted samples as (parking id, local publish time,
+        available, total) tuples to train the forecast model with.
+        """
+        samples = []
+        for parking_id in self.changed_parkings:
+            record = data.get(parking_id)
+            if record is None:
+                continue
+            published = parse_last_update(record.last_update) or dt_util.utcnow()
+            history = self.histories.get(parking_id)
+            if history is None:
+                history = self.histories[parking_id] = OccupancyHistory()
+            if history.add(published.timestamp(), record.available_capacity, record.total_capacity):
+                samples.append((
+                    parking_id,
+                    dt_util.as_local(published),
+                    record.available_capacity,
+                    record.total_capacity,
+                ))
+        return samples
+
+    def _train_and_predict(self, samples, data):
+        """Train the forecast model and predict the sensor horizon.
+
+        Runs in the executor, the model is vectorized over all parkings so
+        both steps take milliseconds.
+        """
+        forecaster = self._get_forecaster()
+        forecaster.update(samples)
+        return forecaster.predict(
+            self._current_capacities(data),
+            dt_util.now(),
+            FORECAST_HORIZON_MINUTES,
+        )
+
+    def _get_forecaster(self):
+        """Return the forecast model, created from the stored one on first use.
+
+        Runs in the executor, so importing numpy does not block the event loop.
+        """
+        with self._forecaster_lock:
+            if self.forecaster is None:
+                from .forecast import OccupancyForecaster
+
+                self.forecaster = (
+                    OccupancyForecaster.from_dict(self._forecast_state)
+                    if self._forecast_state
+                    else OccupancyForecaster()
+                )
+                self._forecast_state = None
+            return self.forecaster
+
+    async def async_predict(self, minutes, parkings=None):
+        """Predict the available spaces of parkings in a number of minutes."""
+        data = self.data or {}
+        if parkings:
+            data = {parking_id: data[parking_id] for parking_id in parkings if parking_id in data}
+        capacities = self._current_capacities(data)
+        now = dt_util.now()
+        return await self.hass.async_add_executor_job(
+            lambda: self._get_forecaster().predict(capacities, now, minutes)
+        )
+
+    async def async_get_spatial_index(self):
+        """Return the spatial index, rebuilt after the locations changed."""
+        if self._spatial is None:
+            self._spatial = await self.hass.async_add_import_executor_job(
+                importlib.import_module, f"{__package__}.spatial"
+            )
+        if (
+            self._spatial_index is None
+            or self._spatial_index_version != self._locations_version
+        ):
+            self._spatial_index = self._spatial.ParkingIndex(self.data or {})
+            self._spatial_index_version = self._locations_version
+        return self._spatial_index
+
+    async def async_find_nearest(self, origins, min_free=1, limit=3, radius_km=None):
+        """Rank the open parkings with min_free spaces by distance per origin."""
+        index = await self.async_get_spatial_index()
+        data = self.data or {}
+        eligible = {
+            parking_id
+            for parking_id, record in data.items()
+            if record.is_open_now and record.available_capacity >= min_free
+        }
+        return [
+            [(data[parking_id], distance) for parking_id, distance in ranked]
+            for ranked in index.nearest(origins, eligible, limit, radius_km)
+        ]
+
+    @staticmethod
+    def _current_capacities(data):
+        """Return the (available, total) spaces of the open parkings."""
+        return {
+            parking_id: (record.available_capacity, record.total_capacity)
+            for parking_id, record in data.items()
+            if record.is_open_now
+        }
+
+    async def _async_fetch_source(self, source):
+        """Fetch the records of a single API.
+
+        Runs within the concurrency limit shared by all sources.
+        """
+        async with SOURCES.limit:
+            return await self._async_fetch_records(source)
+
+    @callback
+    def _async_start_totals(self, source) -> None:
+        """Fetch the totals of an API in the background, unless already running.
+
+        The records of the source do not wait for its totals, nor do the
+        totals take a slot of the concurrency limit of the records.
+        """
+        if source.name in self._totals_tasks:
+            return
+        task = self.hass.async_create_background_task(
+            self._async_fetch_totals(source), f"parking_gent_totals_{source.name}"
+        )
+        self._totals_tasks[source.name] = task
+        task.add_done_callback(lambda _: self._totals_tasks.pop(source.name, None))
+
+    @callback
+    def _async_update_aggregates(self) -> None:
+        """Publish the totals to the aggregate sensors only."""
+        self._set_aggregates(self._remote_totals)
+        for update_callback, context in list(self._listeners.values()):
+            if context == AGGREGATES_LISTENER:
+                update_callback()
+
+    async def _async_fetch_totals(self, source) -> None:
+        """Sum the capacities of all parkings of an API on the server.
+
+        Only the grouped sums are transferred, so the totals of the whole
+        source are known without downloading the unselected records. New
+        totals go to the aggregate sensors right away. A failure keeps the
+        previous totals and does not fail the source.
+        """
+        name = source.name
+        url = self._aggregate_urls[name]
+        try:
+            etag, last_modified = self._totals_validators.get(name, (None, None))
+            result = await self._fetch_api_data(url, etag=etag, last_modified=last_modified)
+            self.fetch_stats["requests"] += 1
+            self.metrics.record_request(name, result.timing)
+            if result.not_modified and name in self._remote_totals:
+                return
+            if result.not_modified:
+                result = await self._fetch_api_data(url)
+                self.metrics.record_request(name, result.timing)
+            self._remote_totals[name] = CapacityTotals.from_groups(
+                result.payload["results"], source.mapping["isOpenNow"]
+            )
+            self._totals_validators[name] = (result.etag, result.last_modified)
+            self._async_update_aggregates()
+        except (asyncio.TimeoutError, aiohttp.ClientError, KeyError, TypeError, ValueError) as err:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Failed to fetch the totals of %s API: %s", name, err)
+
+    async def _async_fetch_records(self, source, full=None):
+        """Fetch and normalize the records of a single API.
+
+        Polls only select the DYNAMIC_FIELDS and merge them with the metadata
+        of the source. Every field is fetched when full is True, by default
+        when the metadata is missing or older than METADATA_REFRESH_INTERVAL,
+        and right away when a poll returns a parking without metadata.
+
+        Returns a tuple of the normalized records keyed by parking id and an
+        error message, which is None when the source was fetched successfully.
+        """
+        data = {}
+        name = source.name
+        if full is None:
+            full = self._metadata_due(name)
+        url = self._metadata_urls[name] if full else self._api_urls[name]
+        try:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Fetching %s from %s API: %s",
+                    "metadata" if full else "data", name, url
+                )
+            
+            # Reuse a catalog just downloaded by the config flow or setup
+            catalog = self._client.get_cached_catalog(source.url)
+            if catalog is not None and name not in self._source_data:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Using cached catalog of %s API", name)
+                start = time.perf_counter()
+                data = self._normalize_records(catalog, source)
+                self.metrics.record(name, "normalize", (time.perf_counter() - start) * 1000)
+                self.metrics.record(name, "kept", len(data))
+                self.metrics.record(name, "dropped", len(catalog) - len(data))
+                self._set_metadata(name, data)
+                return data, None
+            
+            etag, last_modified = self._validators.get(url, (None, None))
+            result = await self._fetch_api_data(
+                url, etag=etag, last_modified=last_modified
+            )
+            self.fetch_stats["requests"] += 1
+            if result.not_modified:
+                self.metrics.record_request(name, result.timing)
+            
+            # Unchanged upstream data: skip decoding and normalization entirely
+            if result.not_modified and name in self._source_data:
+                self.metrics.record(name, "bytes", 0)
+                self.fetch_stats["not_modified"] += 1
+                self.fetch_stats["bytes_saved"] += self._payload_sizes.get(url, 0)
+                self.fetch_stats["parse_cycles_saved"] += 1
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("%s API data not modified since last poll", name)
+                if full:
+                    self._metadata_fetched[name] = dt_util.utcnow()
+                return self._source_data[name], None
+            if result.not_modified:
+                # Validators without cached records, fetch the full payload again
+                result = await self._fetch_api_data(url)
+            
+            # Process records page by page as they are streamed in
+            records = self._client.stream_records(url, result, timeout=API_SOURCE_TIMEOUT)
+            # Drop our reference so the first page is released once consumed
+            result = None
+            normalize = self._normalizers[name]
+            metadata = None if full else self._metadata.get(name, {})
+            schema_checked = False
+            processed_count = 0
+            start = time.perf_counter()
+            async for record in records:
+                if not schema_checked:
+                    self._check_schema(
+                        record, source, source.mapping if full else source.poll_mapping
+                    )
+                    schema_checked = True
+                if self._add_record(data, record, normalize, name, metadata):
+                    processed_count += 1
+            # Waiting for (and decoding) the next pages is not normalization
+            normalize_time = (time.perf_counter() - start) * 1000 - records.wait_time
+            
+            for timing in records.timings:
+                self.metrics.record_request(name, timing)
+            self.metrics.record(name, "bytes", records.size)
+            self.metrics.record(name, "decode", sum(timing.decode for timing in records.timings))
+            self.metrics.record(name, "normalize", normalize_time)
+            self.metrics.record(name, "kept", processed_count)
+            self.metrics.record(name, "dropped", records.received - processed_count)
+            self.fetch_stats["requests"] += records.pages - 1
+            self.fetch_stats["bytes_received"] += records.size
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                if not records.received:
+                    _LOGGER.debug("No results returned from %s API", source.name)
+                _LOGGER.debug("Successfully processed %d/%d records from %s API in %d page(s)", 
+                              processed_count, records.received, source.name, records.pages)
+            self._remember_validators(url, records.etag, records.last_modified, records.size)
+            if full:
+                self._set_metadata(name, data)
+            elif data.keys() - metadata.keys():
+                # A parking without metadata, fetch every field right away
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug(
+                        "New parking locations in %s API: %s",
+                        name, ", ".join(sorted(data.keys() - metadata.keys()))
+                    )
+                return await self._async_fetch_records(source, full=True)
+            return data, None
+            
+        except asyncio.TimeoutError:
+            error_msg = f"Timeout connecting to {source.name} API"
+        except aiohttp.ClientConnectionError:
+            error_msg = f"Connection error to {source.name} API"
+        except aiohttp.ClientResponseError as err:
+            error_msg = f"HTTP error from {source.name} API: {err}"
+        except ValueError as err:
+            error_msg = f"Invalid response from {source.name} API: {err}"
+        except Exception as err:
+            error_msg = f"Unexpected error from {source.name} API: {err}"
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(error_msg)
+        return None, error_msg
+
+    def _metadata_due(self, name) -> bool:
+        """Return True when the metadata of an API has to be fetched."""
+        fetched = self._metadata_fetched.get(name)
+        return (
+            name not in self._metadata
+            or fetched is None
+            or dt_util.utcnow() - fetched >= METADATA_REFRESH_INTERVAL
+        )
+
+    def _set_metadata(self, name, data) -> None:
+        """Keep records fetched with every field as the metadata of an API."""
+        self._metadata[name] = data
+        self._metadata_fetched[name] = dt_util.utcnow()
+
+    def _normalize_records(self, records, source):
+        """Normalize already downloaded records of an API."""
+        data = {}
+        if records:
+            self._check_schema(records[0], source, source.mapping)
+        normalize = self._normalizers[source.name]
+        for record in records:
+            self._add_record(data, record, normalize, source.name)
+        return data
+
+    def _check_schema(self, record, source, mapping) -> None:
+        """Log requested fields missing from a payload, checked once per payload."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            missing = missing_fields(mapping, record)
+            if missing:
+                _LOGGER.debug(
+                    "Missing fields %s in %s API records, using default values",
+                    ", ".join(missing), source.name
+                )
+
+    def _add_record(self, data, record, normalize, api_name, metadata=None) -> bool:
+        """Normalize a record and add it to data if its parking is selected."""
+        try:
+            normalized_record = normalize(record, metadata)
+            parking_id = normalized_record.name
+            if parking_id:
+                # Only include selected parkings if filter is set
+                if not self.selected_parkings or parking_id in self.selected_parkings:
+                    # Keep sharing the previous record while it is unchanged
+                    previous = self.data.get(parking_id) if self.data else None
+                    data[parking_id] = previous if previous == normalized_record else normalized_record
+                    return True
+            else:
+                if _LOGGER.isEnabledFor(logging.DEBUG):
+                    _LOGGER.debug("Record missing name field in %s API", api_name)
+        except Exception as err:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Failed to normalize record from %s API: %s", 
+                    api_name, err
+                )
+        return False
+
+    def _build_api_url(self, source, mapping) -> str:
+        """Build the request URL of the mapped fields of an API for the selected parkings.
+
+        The selection is pushed to the API as a where-clause so only the
+        selected records are transferred. When the clause would get too long
+        the full dataset is fetched and filtered locally instead.
+        """
+        clauses = [source.where] if source.where else []
+        if self.selected_parkings:
+            selection = compose_where_in(
+                source.mapping["name"], sorted(self.selected_parkings)
+            )
+            if len(selection) <= MAX_WHERE_LENGTH:
+                clauses.append(selection)
+            elif _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "Selection too large for a where-clause, fetching all %s records",
+                    source.name,
+                )
+        return compose_records_url(
+            source.dataset,
+            mapping,
+            " and ".join(f"({clause})" for clause in clauses),
+        )
+
+    async def _fetch_api_data(self, url: str, etag=None, last_modified=None):
+        """Fetch data from API with the per-source timeout."""
+        return await self._client.async_fetch(
+            url,
+            etag=etag,
+            last_modified=last_modified,
+            timeout=API_SOURCE_TIMEOUT,
+        )
+
+    def _remember_validators(self, url: str, etag, last_modified, size: int) -> None:
+        """Store the validators of a parsed response for the next request of its URL."""
+        if etag or last_modified:
+            self._validators[url] = (etag, last_modified)
+        else:
+            self._validators.pop(url, None)
+        self._payload_sizes[url] = size
@@ -0,0 +1,42 @@
+"""Diagnostics support for Parking Gent."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .constants import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the state of the coordinator and the fetch pipeline metrics."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "data_version": coordinator.data_version,
+            "parkings": len(coordinator.data or {}),
+            "stale": coordinator.stale,
+            "fetch_stats": dict(coordinator.fetch_stats),
+        },
+        "breakers": {
+            name: {
+                "state": breaker.state,
+                "failures": breaker.failures,
+                "retry_at": breaker.retry_at.isoformat() if breaker.retry_at else None,
+                "last_error": breaker.last_error,
+            }
+            for name, breaker in coordinator.breakers.items()
+        },
+        "metrics": coordinator.metrics.as_dict(),
+    }
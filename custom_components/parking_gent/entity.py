@@ -0,0 +1,83 @@
+"""Base entities of the Parking Gent platforms."""
+
+from collections.abc import Callable, Iterable
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+@callback
+def async_add_parking_entities(
+    coordinator,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[str], Iterable[Entity]],
+) -> None:
+    """Add the entities of every parking, now and once they are known.
+
+    The entities of selected parkings are created right away, before the
+    first refresh has data. Without a selection, entities follow the
+    parkings in the coordinator data, including parkings added later.
+    """
+    selected_parkings = config_entry.data.get("selected_parkings", [])
+    known = set()
+
+    @callback
+    def async_add_new_parkings() -> None:
+        new_parkings = [
+            parking_id
+            for parking_id in selected_parkings or coordinator.data or {}
+            if parking_id not in known
+        ]
+        if not new_parkings:
+            return
+        known.update(new_parkings)
+        async_add_entities(
+            entity
+            for parking_id in new_parkings
+            for entity in create_entities(parking_id)
+        )
+
+    async_add_new_parkings()
+    if not selected_parkings:
+        config_entry.async_on_unload(coordinator.async_add_listener(async_add_new_parkings))
+
+
+class ParkingEntity(CoordinatorEntity):
+    """Base of the entities of a single parking, updated only on change.
+
+    The states they write on coordinator updates are counted in the
+    pipeline metrics, the state written when added is not.
+    """
+
+    def __init__(self, coordinator, parking_id):
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.parking_id = parking_id
+        self._last_update_success = coordinator.last_update_success
+        self._update_from_snapshot()
+
+    def _update_from_snapshot(self) -> None:
+        """Take the state of this parking from the current snapshot."""
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this parking or the coordinator status changed."""
+        update_success = self.coordinator.last_update_success
+        if (
+            update_success == self._last_update_success
+            and self.parking_id not in self.coordinator.changed_parkings
+        ):
+            return
+        self._last_update_success = update_success
+        self._update_from_snapshot()
+        self._async_write_update()
+
+    @callback
+    def _async_write_update(self) -> None:
+        """Write the state of a coordinator update and count it in the pipeline metrics."""
+        self.coordinator.metrics.pending_state_writes += 1
+        self.async_write_ha_state()
@@ -0,0 +1,126 @@
+"""Occupancy forecasting per parking, weekday and time of day."""
+
+from __future__ import annotations
+
+import base64
+import threading
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from .constants import FORECAST_LEARNING_RATE, FORECAST_SLOT_MINUTES
+
+SLOTS_PER_DAY = 24 * 60 // FORECAST_SLOT_MINUTES
+DAYS_PER_WEEK = 7
+
+
+def _slot(moment: datetime) -> tuple[int, int]:
+    """Return the weekday and time-of-day slot of a moment."""
+    return moment.weekday(), (moment.hour * 60 + moment.minute) // FORECAST_SLOT_MINUTES
+
+
+class OccupancyForecaster:
+    """Predict free spaces from a weekday x time-of-day profile per parking.
+
+    The model keeps, for every parking, the average free fraction of every
+    FORECAST_SLOT_MINUTES slot of the week in one (parkings, 7, slots)
+    array. Training is an incremental mean that turns into an exponential
+    moving average after a few weeks, so the model follows seasonal drift.
+    Updates and predictions are vectorized over all parkings and are meant
+    to run in the executor; a lock serializes them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty model."""
+        self._lock = threading.Lock()
+        self._index: dict[str, int] = {}
+        self._free = np.zeros((0, DAYS_PER_WEEK, SLOTS_PER_DAY), dtype=np.float32)
+        self._samples = np.zeros((0, DAYS_PER_WEEK, SLOTS_PER_DAY), dtype=np.float32)
+
+    def _rows(self, parking_ids: Iterable[str]) -> np.ndarray:
+        """Return the model rows of parkings, adding rows for new ones."""
+        new = [parking_id for parking_id in parking_ids if parking_id not in self._index]
+        if new:
+            for parking_id in new:
+                self._index[parking_id] = len(self._index)
+            padding = np.zeros((len(new), DAYS_PER_WEEK, SLOTS_PER_DAY), dtype=np.float32)
+            self._free = np.concatenate((self._free, padding))
+            self._samples = np.concatenate((self._samples, padding))
+        return np.fromiter(
+            (self._index[parking_id] for parking_id in parking_ids), dtype=np.intp
+        )
+
+    def update(self, samples: list[tuple[str, datetime, float, float]]) -> None:
+        """Train the model with (parking id, published at, available, total) samples."""
+        samples = [sample for sample in samples if sample[3] > 0]
+        if not samples:
+            return
+        with self._lock:
+            rows = self._rows([sample[0] for sample in samples])
+            slots = np.array([_slot(sample[1]) for sample in samples], dtype=np.intp)
+            days, times = slots[:, 0], slots[:, 1]
+            free = np.array([sample[2] / sample[3] for sample in samples], dtype=np.float32)
+
+            counts = self._samples[rows, days, times] + 1
+            rate = np.maximum(1 / counts, FORECAST_LEARNING_RATE)
+            current = self._free[rows, days, times]
+            self._free[rows, days, times] = current + rate * (np.clip(free, 0, 1) - current)
+            self._samples[rows, days, times] = counts
+
+    def predict(
+        self,
+        current: Mapping[str, tuple[float, float]],
+        now: datetime,
+        minutes: int,
+    ) -> dict[str, int]:
+        """Predict the free spaces of parkings in a number of minutes.
+
+        current maps parking ids to their (available, total) spaces. The
+        prediction adds the profile's expected change between now and the
+        target slot to the current free fraction; parkings without profile
+        data for both slots keep their current value.
+        """
+        parking_ids = [parking_id for parking_id, (_, total) in current.items() if total > 0]
+        if not parking_ids:
+            return {}
+        available = np.array([current[parking_id][0] for parking_id in parking_ids], dtype=np.float32)
+        total = np.array([current[parking_id][1] for parking_id in parking_ids], dtype=np.float32)
+        day_now, slot_now = _slot(now)
+        day_then, slot_then = _slot(now + timedelta(minutes=minutes))
+
+        with self._lock:
+            rows = self._rows(parking_ids)
+            known = (self._samples[rows, day_now, slot_now] > 0) & (
+                self._samples[rows, day_then, slot_then] > 0
+            )
+            change = self._free[rows, day_then, slot_then] - self._free[rows, day_now, slot_now]
+
+        predicted = np.clip(available / total + np.where(known, change, 0), 0, 1) * total
+        return dict(zip(parking_ids, np.rint(predicted).astype(int).tolist()))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the model in a compact form for storage."""
+        with self._lock:
+            return {
+                "parkings": list(self._index),
+                "free": base64.b64encode(self._free.tobytes()).decode(),
+                "samples": base64.b64encode(self._samples.tobytes()).decode(),
+            }
+
+    @classmethod
+    def from_dict(cls, stored: Mapping[str, Any]) -> OccupancyForecaster:
+        """Restore a model saved with as_dict."""
+        forecaster = cls()
+        parkings = stored.get("parkings", [])
+        shape = (len(parkings), DAYS_PER_WEEK, SLOTS_PER_DAY)
+        try:
+            free = np.frombuffer(base64.b64decode(stored["free"]), dtype=np.float32).reshape(shape)
+            samples = np.frombuffer(base64.b64decode(stored["samples"]), dtype=np.float32).reshape(shape)
+        except (KeyError, ValueError):
+            return forecaster
+        forecaster._index = {parking_id: row for row, parking_id in enumerate(parkings)}
+        forecaster._free = free.copy()
+        forecaster._samples = samples.copy()
+        return forecaster
@@ -0,0 +1,98 @@
+"""Occupancy history ring buffers of the tracked parkings."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .constants import HISTORY_SIZE, RATE_SAMPLES
+
+# Weight of the newest sample in the smoothed occupancy
+OCCUPANCY_SMOOTHING = 0.3
+
+
+class OccupancyHistory:
+    """Fixed-size ring buffer of the published availability of one parking.
+
+    Samples are kept in two preallocated arrays of HISTORY_SIZE doubles, so
+    memory is bounded and every update and derived value costs O(1): the
+    rates compare the newest sample with the one RATE_SAMPLES positions back.
+    """
+
+    __slots__ = ("_timestamps", "_available", "_head", "_count", "smoothed_occupancy")
+
+    def __init__(self, size: int = HISTORY_SIZE) -> None:
+        """Initialize an empty history."""
+        self._timestamps = array("d", bytes(8 * size))
+        self._available = array("d", bytes(8 * size))
+        self._head = 0
+        self._count = 0
+        self.smoothed_occupancy: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of stored samples."""
+        return self._count
+
+    def add(self, timestamp: float, available: float, total: float) -> bool:
+        """Store a published sample, ignoring republished or older ones."""
+        size = len(self._timestamps)
+        if self._count and timestamp <= self._timestamps[(self._head - 1) % size]:
+            return False
+
+        self._timestamps[self._head] = timestamp
+        self._available[self._head] = available
+        self._head = (self._head + 1) % size
+        self._count = min(self._count + 1, size)
+
+        if total > 0:
+            occupancy = 100 * (total - available) / total
+            if self.smoothed_occupancy is None:
+                self.smoothed_occupancy = occupancy
+            else:
+                self.smoothed_occupancy += OCCUPANCY_SMOOTHING * (occupancy - self.smoothed_occupancy)
+        return True
+
+    @property
+    def fill_rate(self) -> float | None:
+        """Return the spaces taken per minute, negative while emptying."""
+        if self._count < 2:
+            return None
+        size = len(self._timestamps)
+        newest = (self._head - 1) % size
+        oldest = (self._head - 1 - min(self._count - 1, RATE_SAMPLES)) % size
+        minutes = (self._timestamps[newest] - self._timestamps[oldest]) / 60
+        if minutes <= 0:
+            return None
+        return (self._available[oldest] - self._available[newest]) / minutes
+
+    @property
+    def minutes_until_full(self) -> float | None:
+        """Return the estimated minutes until no spaces are left."""
+        rate = self.fill_rate
+        if not rate or rate <= 0:
+            return None
+        return self._available[(self._head - 1) % len(self._timestamps)] / rate
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the samples, oldest first, for storage."""
+        size = len(self._timestamps)
+        order = [(self._head - self._count + index) % size for index in range(self._count)]
+        return {
+            "timestamps": [self._timestamps[index] for index in order],
+            "available": [self._available[index] for index in order],
+            "smoothed_occupancy": self.smoothed_occupancy,
+        }
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> OccupancyHistory:
+        """Restore a history saved with as_dict."""
+        history = cls()
+        size = len(history._timestamps)
+        samples = list(zip(stored.get("timestamps", []), stored.get("available", [])))
+        for timestamp, available in samples[-size:]:
+            history._timestamps[history._head] = timestamp
+            history._available[history._head] = available
+            history._head = (history._head + 1) % size
+            history._count += 1
+        history.smoothed_occupancy = stored.get("smoothed_occupancy")
+        return history
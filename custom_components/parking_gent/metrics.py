@@ -0,0 +1,121 @@
+"""Rolling metrics of the fetch pipeline."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+from .api import RequestTiming
+from .constants import METRICS_WINDOW
+
+# Scope of the metrics of a whole refresh, next to one scope per source
+METRICS_CYCLE = "cycle"
+# Coordinator listener context of the metric sensors, notified after the others
+METRICS_LISTENER = "metrics"
+
+PERCENTILES = (50, 95, 99)
+
+
+class RollingWindow:
+    """The last values of a metric, summarized as percentiles."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize an empty window."""
+        self._values: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        """Return the number of values in the window."""
+        return len(self._values)
+
+    def add(self, value: float) -> None:
+        """Add a value, dropping the oldest one when the window is full."""
+        self._values.append(value)
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return the nearest-rank percentiles, mean and last value."""
+        if not self._values:
+            return {"samples": 0}
+        ordered = sorted(self._values)
+        summary: dict[str, float | int | None] = {
+            f"p{percentile}": ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+            for percentile in PERCENTILES
+        }
+        summary["mean"] = sum(ordered) / len(ordered)
+        summary["last"] = self._values[-1]
+        summary["samples"] = len(ordered)
+        return summary
+
+
+class FetchMetrics:
+    """Rolling timings and counters of every source and refresh cycle.
+
+    Metrics are kept per scope, the name of a source or METRICS_CYCLE:
+
+    - dns, connect, ttfb, latency: request phases in ms, per request
+    - bytes: payload size on the wire, per fetch of a source
+    - decode, normalize: ms spent parsing JSON and building records
+    - kept, dropped: records added to the snapshot and records skipped
+    - success: 100 for a successful fetch and 0 for a failed one, so the
+      mean is the success rate in percent
+    - duration, state_writes: time of a refresh and the parking entity
+      states it wrote, in the cycle scope
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """Initialize the metrics."""
+        self._window = window
+        self._series: dict[str, dict[str, RollingWindow]] = {}
+        self.last_errors: dict[str, str | None] = {}
+        self.cycles = 0
+        self.pending_state_writes = 0
+        # Milliseconds spent in the setup of the entry, and until its first refresh completed
+        self.setup_time: float | None = None
+        self.first_refresh_time: float | None = None
+
+    def record(self, scope: str, metric: str, value: float) -> None:
+        """Add a value to a metric of a scope."""
+        series = self._series.setdefault(scope, {})
+        window = series.get(metric)
+        if window is None:
+            window = series[metric] = RollingWindow(self._window)
+        window.add(value)
+
+    def record_request(self, scope: str, timing: RequestTiming | None) -> None:
+        """Add the phases of a request."""
+        if timing is None:
+            return
+        if timing.dns is not None:
+            self.record(scope, "dns", timing.dns)
+        if timing.connect is not None:
+            self.record(scope, "connect", timing.connect)
+        if timing.ttfb is not None:
+            self.record(scope, "ttfb", timing.ttfb)
+        if timing.total is not None:
+            self.record(scope, "latency", timing.total)
+
+    def record_outcome(self, scope: str, error: str | None) -> None:
+        """Add the outcome of a fetch, None when it succeeded."""
+        self.record(scope, "success", 0.0 if error else 100.0)
+        self.last_errors[scope] = error
+
+    def summary(self, scope: str, metric: str) -> dict[str, float | int | None]:
+        """Return the summary of a metric of a scope."""
+        window = self._series.get(scope, {}).get(metric)
+        return window.summary() if window is not None else {"samples": 0}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all summaries, for the diagnostics download."""
+        return {
+            "window": self._window,
+            "cycles": self.cycles,
+            "setup_time": self.setup_time,
+            "first_refresh_time": self.first_refresh_time,
+            "last_errors": dict(self.last_errors),
+            "scopes": {
+                scope: {metric: window.summary() for metric, window in series.items()}
+                for scope, series in self._series.items()
+            },
+        }
@@ -0,0 +1,115 @@
+"""Data models of the Parking Gent integration."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so equal values of consecutive polls share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class ParkingRecord:
+    """Immutable, normalized state of a single parking location.
+
+    Records use __slots__ and never change after creation, so one instance
+    can be shared by the coordinator, the stored snapshot and the entities
+    without copying. Names and the static text fields are interned.
+    """
+
+    __slots__ = (
+        "name",
+        "available_capacity",
+        "is_open_now",
+        "last_update",
+        "latitude",
+        "longitude",
+        "occupation",
+        "opening_times",
+        "total_capacity",
+        "url",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        available_capacity: int = 0,
+        is_open_now: bool = False,
+        last_update: str | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        occupation: int = 0,
+        opening_times: str | None = None,
+        total_capacity: int = 0,
+        url: str | None = None,
+    ) -> None:
+        """Initialize the record."""
+        set_slot = object.__setattr__
+        set_slot(self, "name", _intern(name))
+        set_slot(self, "available_capacity", available_capacity)
+        set_slot(self, "is_open_now", is_open_now)
+        set_slot(self, "last_update", last_update)
+        set_slot(self, "latitude", latitude)
+        set_slot(self, "longitude", longitude)
+        set_slot(self, "occupation", occupation)
+        set_slot(self, "opening_times", _intern(opening_times))
+        set_slot(self, "total_capacity", total_capacity)
+        set_slot(self, "url", _intern(url))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse to modify the record."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Refuse to modify the record."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other: object) -> bool:
+        """Compare all fields of two records."""
+        if self is other:
+            return True
+        if not isinstance(other, ParkingRecord):
+            return NotImplemented
+        return self.to_row() == other.to_row()
+
+    def __hash__(self) -> int:
+        """Hash all fields of the record."""
+        return hash(tuple(self.to_row()))
+
+    def __repr__(self) -> str:
+        """Return a readable representation of the record."""
+        fields = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    @property
+    def location(self) -> dict[str, float] | None:
+        """Return the location in the lat/lon format of the API."""
+        if self.latitude is None or self.longitude is None:
+            return None
+        return {"lat": self.latitude, "lon": self.longitude}
+
+    def to_row(self) -> list[Any]:
+        """Return the field values in __slots__ order."""
+        return [getattr(self, slot) for slot in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row: list[Any]) -> ParkingRecord:
+        """Create a record from values in __slots__ order."""
+        return cls(*row)
+
+
+def parse_last_update(value: str | None) -> datetime | None:
+    """Parse a lastupdate value of the API into an aware datetime."""
+    if not isinstance(value, str):
+        return None
+    parsed = dt_util.parse_datetime(value)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=dt_util.UTC)
+    return parsed
@@ -0,0 +1,105 @@
+"""Compiled normalizers turning raw API records into ParkingRecords."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from .models import ParkingRecord
+
+Normalizer = Callable[[Mapping[str, Any], Mapping[str, ParkingRecord] | None], ParkingRecord]
+
+_COMPILED: dict[tuple[tuple[str, str], ...], Normalizer] = {}
+
+
+def _to_number(value: Any) -> int | float:
+    """Coerce a non-int numeric API value, falling back to 0."""
+    if isinstance(value, float):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def compile_normalizer(mapping: Mapping[str, str]) -> Normalizer:
+    """Compile a field mapping into a normalizer for a single API.
+
+    Source keys, defaults and coercions are resolved here once, so the
+    returned function only does the lookups of one record. Missing values
+    default to 0 for the capacities and occupation, False for isOpenNow and
+    None for everything else.
+
+    The normalizer optionally takes the metadata of the source, the last
+    records fetched with all fields keyed by name. Records polled with only
+    the DYNAMIC_FIELDS then get their location, opening times, total
+    capacity and URL from the metadata of their parking.
+    """
+    key = tuple(mapping.items())
+    if (normalizer := _COMPILED.get(key)) is not None:
+        return normalizer
+
+    name_key = mapping.get("name")
+    available_key = mapping.get("availableCapacity")
+    open_key = mapping.get("isOpenNow")
+    last_update_key = mapping.get("lastUpdate")
+    location_key = mapping.get("location")
+    occupation_key = mapping.get("occupation")
+    opening_times_key = mapping.get("openingTimes")
+    total_key = mapping.get("totalCapacity")
+    url_key = mapping.get("url")
+
+    def normalize(
+        record: Mapping[str, Any],
+        metadata: Mapping[str, ParkingRecord] | None = None,
+    ) -> ParkingRecord:
+        get = record.get
+        available = get(available_key)
+        occupation = get(occupation_key)
+        if metadata is not None:
+            name = get(name_key)
+            static = metadata.get(name)
+            if static is not None:
+                return ParkingRecord(
+                    name,
+                    available if available.__class__ is int else _to_number(available),
+                    bool(get(open_key)),
+                    get(last_update_key),
+                    static.latitude,
+                    static.longitude,
+                    occupation if occupation.__class__ is int else _to_number(occupation),
+                    static.opening_times,
+                    static.total_capacity,
+                    static.url,
+                )
+        location = get(location_key)
+        if location.__class__ is dict:
+            latitude = location.get("lat")
+            longitude = location.get("lon")
+        else:
+            latitude = longitude = None
+        total = get(total_key)
+        return ParkingRecord(
+            get(name_key),
+            available if available.__class__ is int else _to_number(available),
+            bool(get(open_key)),
+            get(last_update_key),
+            latitude,
+            longitude,
+            occupation if occupation.__class__ is int else _to_number(occupation),
+            get(opening_times_key),
+            total if total.__class__ is int else _to_number(total),
+            get(url_key),
+        )
+
+    _COMPILED[key] = normalize
+    return normalize
+
+
+def missing_fields(mapping: Mapping[str, str], record: Mapping[str, Any]) -> list[str]:
+    """Return the mapped source fields absent from a sample record.
+
+    Run once per payload: every record of an ODS response carries the same
+    selected fields, so one record tells whether the schema changed.
+    """
+    return [field for field in mapping.values() if field not in record]
@@ -0,0 +1,143 @@
+"""Profiling of the coordinator refresh cycles."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import gzip
+import io
+import pstats
+import time
+import tracemalloc
+
+from .constants import PROFILE_TOP_ALLOCATIONS, PROFILE_TOP_FUNCTIONS
+
+# Allocations of the profiling itself are not part of the report
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class RefreshProfiler:
+    """Profile a number of refresh cycles with cProfile and tracemalloc.
+
+    The profiler only runs while a cycle does, from the first request to the
+    last entity state write it triggers. Other coroutines running on the
+    event loop while a cycle awaits a response are included as well, and
+    work handed to the executor is not. One profiler can be shared by the
+    coordinators of several config entries; every refresh counts as a cycle.
+    """
+
+    def __init__(self, cycles: int, path: str) -> None:
+        """Initialize the profiler, to be started by the next refresh."""
+        self.cycles = cycles
+        self.path = path
+        self.completed = 0
+        self.done = asyncio.Event()
+        self._profile = cProfile.Profile()
+        self._active = 0
+        self._start = 0.0
+        self._durations: list[float] = []
+        self._traced_memory: list[tuple[int, int]] = []
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._started_tracing = False
+        self._aborted = False
+        # Why the profile was aborted before every cycle completed
+        self.error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Return True once every requested cycle has been profiled or it was aborted."""
+        return self._aborted or self.completed >= self.cycles
+
+    def start_cycle(self) -> bool:
+        """Start profiling a refresh cycle.
+
+        Returns False when the cycle cannot be profiled. cProfile allows one
+        active profiler at a time since Python 3.12, so the profile is
+        aborted when another one, like the profiler integration, is running.
+        """
+        if self._aborted:
+            return False
+        if self._baseline is None:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._baseline = tracemalloc.take_snapshot()
+        self._active += 1
+        if self._active == 1:
+            # Overlapping cycles of several entries share one profiling run
+            self._start = time.perf_counter()
+            try:
+                self._profile.enable()
+            except ValueError as err:
+                self.error = str(err)
+                self.abort()
+                return False
+        return True
+
+    def end_cycle(self) -> None:
+        """Stop profiling a refresh cycle and snapshot the allocations."""
+        if self._aborted:
+            return
+        self._active -= 1
+        if self._active:
+            self.completed += 1
+            return
+        self._profile.disable()
+        self._durations.append((time.perf_counter() - self._start) * 1000)
+        self._traced_memory.append(tracemalloc.get_traced_memory())
+        self.completed += 1
+        if self.finished:
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+            self.done.set()
+
+    def abort(self) -> None:
+        """Stop profiling before every cycle completed, without a report."""
+        self._aborted = True
+        self._profile.disable()
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.done.set()
+
+    def write_report(self) -> str:
+        """Write the gzip compressed report and return its path.
+
+        Sorting the statistics and comparing the snapshots is slow, so this
+        runs in the executor.
+        """
+        report = self._build_report()
+        with gzip.open(self.path, "wt", encoding="utf-8") as output:
+            output.write(report)
+        return self.path
+
+    def _build_report(self) -> str:
+        """Return the text of the report."""
+        output = io.StringIO()
+        output.write(f"Parking Gent profile of {self.completed} refresh cycle(s)\n\n")
+        output.write("Cycle durations (ms) and traced memory after each (current/peak KiB):\n")
+        for duration, (current, peak) in zip(self._durations, self._traced_memory):
+            output.write(f"  {duration:10.1f}  {current / 1024:12.1f} / {peak / 1024:.1f}\n")
+
+        stats = pstats.Stats(self._profile, stream=output)
+        stats.strip_dirs()
+        output.write(f"\n\nTop {PROFILE_TOP_FUNCTIONS} functions by cumulative time\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+        output.write(f"\nTop {PROFILE_TOP_FUNCTIONS} functions by own time\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(PROFILE_TOP_FUNCTIONS)
+
+        if self._baseline is not None and self._snapshot is not None:
+            snapshot = self._snapshot.filter_traces(_SNAPSHOT_FILTERS)
+            baseline = self._baseline.filter_traces(_SNAPSHOT_FILTERS)
+            output.write(f"\nTop {PROFILE_TOP_ALLOCATIONS} allocations after the last cycle\n")
+            for statistic in snapshot.statistics("lineno")[:PROFILE_TOP_ALLOCATIONS]:
+                output.write(f"  {statistic}\n")
+            output.write(f"\nTop {PROFILE_TOP_ALLOCATIONS} allocation changes since the first cycle\n")
+            for statistic in snapshot.compare_to(baseline, "lineno")[:PROFILE_TOP_ALLOCATIONS]:
+                output.write(f"  {statistic}\n")
+        return output.getvalue()
@@ -0,0 +1,105 @@
+"""Adaptive polling interval for the Parking Gent coordinator."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .constants import (
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    NEAR_CAPACITY_OCCUPATION,
+    PUBLISH_GRACE,
+    SCAN_INTERVAL,
+)
+from .models import ParkingRecord, parse_last_update
+
+_LOGGER = logging.getLogger(__name__)
+
+# Weight of the newest publish delta in the cadence moving average
+CADENCE_SMOOTHING = 0.3
+MAX_BACKOFF_STEPS = 4
+
+
+@dataclass
+class SourceCadence:
+    """Observed publish cadence of a single API."""
+
+    last_publish: datetime | None = None
+    cadence: timedelta | None = None
+    unchanged_polls: int = 0
+
+
+class AdaptivePollScheduler:
+    """Learn how often each API publishes and poll just after the next publish.
+
+    The cadence is learned from the deltas of the newest lastUpdate value per
+    API. Polls back off while data stays unchanged or every garage is closed
+    and tighten to MIN_SCAN_INTERVAL while a tracked garage is nearly full.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self.sources: dict[str, SourceCadence] = {}
+
+    def observe(self, source: str, records: Iterable[ParkingRecord]) -> None:
+        """Update the cadence of a source with the records of a poll."""
+        latest = None
+        for record in records:
+            published = parse_last_update(record.last_update)
+            if published is not None and (latest is None or published > latest):
+                latest = published
+        if latest is None:
+            return
+
+        state = self.sources.setdefault(source, SourceCadence())
+        if state.last_publish is None or latest < state.last_publish:
+            state.last_publish = latest
+            return
+        if latest == state.last_publish:
+            state.unchanged_polls += 1
+            return
+
+        delta = latest - state.last_publish
+        if state.cadence is None:
+            state.cadence = delta
+        else:
+            state.cadence = state.cadence * (1 - CADENCE_SMOOTHING) + delta * CADENCE_SMOOTHING
+        state.last_publish = latest
+        state.unchanged_polls = 0
+
+    def next_interval(
+        self, data: Mapping[str, ParkingRecord], now: datetime | None = None
+    ) -> timedelta:
+        """Return the delay until the next poll."""
+        now = now or dt_util.utcnow()
+
+        if any(
+            record.is_open_now
+            and (record.occupation or 0) >= NEAR_CAPACITY_OCCUPATION
+            for record in data.values()
+        ):
+            return MIN_SCAN_INTERVAL
+        if data and not any(record.is_open_now for record in data.values()):
+            return MAX_SCAN_INTERVAL
+
+        delays = []
+        for state in self.sources.values():
+            backoff = 2 ** min(state.unchanged_polls, MAX_BACKOFF_STEPS)
+            if state.cadence is None or state.last_publish is None:
+                delays.append(SCAN_INTERVAL * backoff)
+                continue
+            expected = state.last_publish + state.cadence + PUBLISH_GRACE
+            if expected > now:
+                delays.append(expected - now)
+            else:
+                # Publish is overdue, retry with a growing delay
+                delays.append(PUBLISH_GRACE * backoff)
+
+        interval = min(delays) if delays else SCAN_INTERVAL
+        return max(MIN_SCAN_INTERVAL, min(MAX_SCAN_INTERVAL, interval))
+
@@ -1,50 +1,28 @@
 import logging
-import requests
-from typing import Any, Dict, Optional, Mapping
-from homeassistant.components.sensor import SensorEntity
+from collections.abc import Callable
+from dataclasses import dataclass
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed, CoordinatorEntity
-
-from .constants import (
-    SCAN_INTERVAL,
-    FIELDS_GARAGE,
-    # FIELDS_MOBI,
-    FIELDS_PR,
-    API_PARKING,
-    API_PR,
-    # API_MOBI,
-    API_TIMEOUT,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-_LOGGER = logging.getLogger(__name__)
+from .aggregates import CapacityTotals
+from .breaker import BREAKER_STATES
+from .coordinator import AGGREGATE_CITY, AGGREGATES_LISTENER
+from .entity import ParkingEntity, async_add_parking_entities
+from .history import OccupancyHistory
+from .metrics import METRICS_CYCLE, METRICS_LISTENER
+from .sources import SOURCES
+from .constants import DOMAIN, FORECAST_HORIZON_MINUTES
 
-""" requests only fetch a subset of relevant data, more documentation via the url. """
-""" the mobi endpoint is only used for 3 extra parking locations from interparking that are not available in the parking garage or p+r endpoints"""
-""" P+R API temporarily disabled due to 404 errors - will be re-enabled when City of Gent fixes the endpoint """
-PARKING_API_URLS = [
-    {
-        "documentationUrl": "https://data.stad.gent/explore/dataset/bezetting-parkeergarages-real-time/information/?sort=-occupation",
-        "url": API_PARKING,
-        "mapping": FIELDS_GARAGE,
-        "name": "Parking Garages",
-    },
-    # Temporarily disabled due to 404 errors from City of Gent API
-    # Will be re-enabled when endpoint is fixed
-    # {
-    #     "documentationUrl": "https://data.stad.gent/explore/dataset/real-time-bezetting-pr-gent/information/?sort=name",
-    #     "url": API_PR,
-    #     "mapping": FIELDS_PR,
-    #     "name": "P+R Parking",
-    # },
-    # {
-    #     "documentationUrl": "https://data.stad.gent/explore/dataset/mobi-parkings/information/",
-    #     "url": API_MOBI,
-    #     "mapping": FIELDS_MOBI,
-    #     "name": "Mobi Parkings",
-    # },
-]
+_LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup_entry(
@@ -54,236 +32,424 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Parking Gent sensor platform."""
     
-    # Get user's parking selection
-    selected_parkings = config_entry.data.get("selected_parkings", [])
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     
-    coordinator = ParkingGentCoordinator(hass, selected_parkings)
+    def create_parking_sensors(parking_id):
+        return [
+            ParkingSensor(coordinator, parking_id),
+            *(
+                ParkingTrendSensor(coordinator, parking_id, description)
+                for description in TREND_SENSORS
+            ),
+            ParkingForecastSensor(coordinator, parking_id),
+        ]
     
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except UpdateFailed as err:
-        _LOGGER.error("Failed to fetch initial data: %s", err)
-        # Don't raise here, let the coordinator handle retries
-        # The sensors will show as unavailable until data is fetched
+    async_add_parking_entities(
+        coordinator, config_entry, async_add_entities, create_parking_sensors
+    )
     
     sensors = []
-    if coordinator.data:
-        for parking_id, parking_data in coordinator.data.items():
-            # Only create sensors for selected parkings
-            if not selected_parkings or parking_id in selected_parkings:
-                sensors.append(ParkingSensor(coordinator, parking_id, parking_data))
+    sensors.extend(
+        ParkingAggregateSensor(coordinator, scope, description)
+        for scope in [AGGREGATE_CITY, *(source.name for source in SOURCES.enabled)]
+        for description in AGGREGATE_SENSORS
+    )
+    sensors.extend(
+        ApiCircuitSensor(coordinator, source.name)
+        for source in SOURCES.enabled
+    )
+    sensors.extend(
+        PipelineMetricSensor(coordinator, source.name, description)
+        for source in SOURCES.enabled
+        for description in SOURCE_METRIC_SENSORS
+    )
+    sensors.extend(
+        PipelineMetricSensor(coordinator, METRICS_CYCLE, description)
+        for description in CYCLE_METRIC_SENSORS
+    )
     
     async_add_entities(sensors)
 
 
-class ParkingGentCoordinator(DataUpdateCoordinator):
-    """Fetch and normalize parking data from Stad Gent API."""
-
-    def __init__(self, hass, selected_parkings=None):
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="Parking Gent",
-            update_interval=SCAN_INTERVAL,
-        )
-        self.hass = hass
-        self.selected_parkings = selected_parkings or []
-        self._last_successful_data = {}
-
-    async def _async_update_data(self):
-        """Fetch and normalize data from API."""
-        data = {}
-        failed_apis = []
-        
-        for api_config in PARKING_API_URLS:
-            try:
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug("Fetching data from %s API: %s", api_config["name"], api_config["url"])
-                
-                response = await self.hass.async_add_executor_job(
-                    self._fetch_api_data, api_config["url"]
-                )
-                
-                api_data = response.json()
-                
-                # Validate response structure
-                if "results" not in api_data:
-                    raise ValueError(f"API response missing 'results' field")
-                
-                results = api_data.get("results", [])
-                if not results:
-                    if _LOGGER.isEnabledFor(logging.DEBUG):
-                        _LOGGER.debug("No results returned from %s API", api_config["name"])
-                    continue
-                
-                # Process records
-                processed_count = 0
-                for record in results:
-                    try:
-                        normalized_record = self._normalize_record(
-                            record, api_config["mapping"]
-                        )
-                        parking_id = normalized_record.get("name")
-                        if parking_id:
-                            # Only include selected parkings if filter is set
-                            if not self.selected_parkings or parking_id in self.selected_parkings:
-                                data[parking_id] = normalized_record
-                                processed_count += 1
-                        else:
-                            if _LOGGER.isEnabledFor(logging.DEBUG):
-                                _LOGGER.debug("Record missing name field in %s API", api_config["name"])
-                    except Exception as err:
-                        if _LOGGER.isEnabledFor(logging.DEBUG):
-                            _LOGGER.debug(
-                                "Failed to normalize record from %s API: %s", 
-                                api_config["name"], err
-                            )
-                        continue
-                
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug("Successfully processed %d/%d records from %s API", 
-                                  processed_count, len(results), api_config["name"])
-                
-            except requests.exceptions.Timeout:
-                error_msg = f"Timeout connecting to {api_config['name']} API"
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(error_msg)
-                failed_apis.append(error_msg)
-            except requests.exceptions.ConnectionError:
-                error_msg = f"Connection error to {api_config['name']} API"
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(error_msg)
-                failed_apis.append(error_msg)
-            except requests.exceptions.HTTPError as err:
-                error_msg = f"HTTP error from {api_config['name']} API: {err}"
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(error_msg)
-                failed_apis.append(error_msg)
-            except ValueError as err:
-                error_msg = f"Invalid response from {api_config['name']} API: {err}"
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(error_msg)
-                failed_apis.append(error_msg)
-            except Exception as err:
-                error_msg = f"Unexpected error from {api_config['name']} API: {err}"
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug(error_msg)
-                failed_apis.append(error_msg)
-        
-        # If we got some data, update our successful data cache
-        if data:
-            self._last_successful_data = data
-            if failed_apis and _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug(
-                    "Partial data update successful (%d parking locations). Failed APIs: %s",
-                    len(data), "; ".join(failed_apis)
-                )
-            elif _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug("Full data update successful (%d parking locations)", len(data))
-            return data
-        
-        # If no new data but we have cached data, use that with a warning
-        if self._last_successful_data:
-            _LOGGER.warning(
-                "All APIs failed, using cached data (%d parking locations)",
-                len(self._last_successful_data)
-            )
-            if _LOGGER.isEnabledFor(logging.DEBUG):
-                _LOGGER.debug("API errors: %s", "; ".join(failed_apis))
-            return self._last_successful_data
-        
-        # If no data at all, raise UpdateFailed
-        error_msg = f"All parking APIs failed and no cached data available"
-        if _LOGGER.isEnabledFor(logging.DEBUG):
-            error_msg += f": {'; '.join(failed_apis)}"
-        _LOGGER.error(error_msg)
-        raise UpdateFailed(error_msg)
-
-    def _fetch_api_data(self, url: str):
-        """Fetch data from API with timeout."""
-        return requests.get(url, timeout=API_TIMEOUT)
-
-    def _normalize_record(self, record, mapping):
-        """Normalize the record based on the mapping."""
-        normalized = {}
-        for target_key, source_key in mapping.items():
-            value = record.get(source_key)
-            if value is not None:
-                normalized[target_key] = value
-            else:
-                # Set default values for critical fields
-                if target_key == "availableCapacity":
-                    normalized[target_key] = 0
-                elif target_key == "isOpenNow":
-                    normalized[target_key] = False
-                elif target_key == "totalCapacity":
-                    normalized[target_key] = 0
-                elif target_key == "occupation":
-                    normalized[target_key] = 0
-                else:
-                    normalized[target_key] = None
-                    
-                if _LOGGER.isEnabledFor(logging.DEBUG):
-                    _LOGGER.debug("Missing field '%s' in record, using default value", source_key)
-        
-        return normalized
-
-
-class ParkingSensor(CoordinatorEntity, SensorEntity):
+class ParkingSensor(ParkingEntity, SensorEntity):
     """Representation of a Parking sensor."""
 
-    def __init__(self, coordinator, parking_id, parking_data):
+    def __init__(self, coordinator, parking_id):
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.parking_id = parking_id
-        self._parking_data = parking_data
         self._attr_icon = "mdi:parking"
         self._attr_native_unit_of_measurement = "spaces"
         self._attr_unique_id = f"parking_{parking_id.lower().replace(' ', '_')}"
-        self._attr_name = parking_data.get("name", parking_id)
+        self._attr_name = parking_id
+        super().__init__(coordinator, parking_id)
+
+    def _update_from_snapshot(self) -> None:
+        """Take the value and prebuilt attributes of the current snapshot."""
+        data = self.coordinator.data
+        record = data.get(self.parking_id) if data else None
+        if record is not None:
+            self._attr_native_value = record.available_capacity
+        else:
+            self._attr_native_value = 0 if data else None
+        self._is_open = bool(record and record.is_open_now)
+        self._attr_extra_state_attributes = self.coordinator.attributes.get(self.parking_id, {})
+
+    @property
+    def available(self):
+        """Return True if the entity is available."""
+        return self.coordinator.last_update_success and self._is_open
+
+
+@dataclass(frozen=True, kw_only=True)
+class ParkingTrendSensorDescription(SensorEntityDescription):
+    """Describes a sensor derived from the occupancy history of a parking."""
+
+    value_fn: Callable[[OccupancyHistory], float | None]
+
+
+TREND_SENSORS = (
+    ParkingTrendSensorDescription(
+        key="fill_rate",
+        name="fill rate",
+        icon="mdi:car-arrow-right",
+        native_unit_of_measurement="spaces/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda history: history.fill_rate,
+    ),
+    ParkingTrendSensorDescription(
+        key="smoothed_occupancy",
+        name="smoothed occupancy",
+        icon="mdi:chart-bell-curve-cumulative",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda history: history.smoothed_occupancy,
+    ),
+    ParkingTrendSensorDescription(
+        key="time_to_full",
+        name="time to full",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        value_fn=lambda history: history.minutes_until_full,
+    ),
+)
+
+
+class ParkingTrendSensor(ParkingEntity, SensorEntity):
+    """Sensor derived from the occupancy history of a parking."""
+
+    entity_description: ParkingTrendSensorDescription
+
+    def __init__(self, coordinator, parking_id, description):
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._attr_unique_id = f"parking_{parking_id.lower().replace(' ', '_')}_{description.key}"
+        self._attr_name = f"{parking_id} {description.name}"
+        super().__init__(coordinator, parking_id)
+
+    def _update_from_snapshot(self) -> None:
+        """Compute the value from the history of this parking."""
+        history = self.coordinator.histories.get(self.parking_id)
+        self._attr_native_value = (
+            self.entity_description.value_fn(history) if history else None
+        )
+
+
+class ParkingForecastSensor(ParkingEntity, SensorEntity):
+    """Predicted available spaces of a parking FORECAST_HORIZON_MINUTES ahead."""
+
+    _attr_icon = "mdi:crystal-ball"
+    _attr_native_unit_of_measurement = "spaces"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, parking_id):
+        """Initialize the sensor."""
+        self._attr_unique_id = f"parking_{parking_id.lower().replace(' ', '_')}_forecast"
+        self._attr_name = f"{parking_id} in {FORECAST_HORIZON_MINUTES} minutes"
+        super().__init__(coordinator, parking_id)
+
+    def _update_from_snapshot(self) -> None:
+        """Take the prediction of the last refresh."""
+        self._attr_native_value = self.coordinator.forecasts.get(self.parking_id)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the prediction or the coordinator status changed.
+
+        Predictions move with the time of day too, so they are compared
+        directly instead of relying on the changed parkings of the snapshot.
+        """
+        update_success = self.coordinator.last_update_success
+        forecast = self.coordinator.forecasts.get(self.parking_id)
+        if (
+            update_success == self._last_update_success
+            and forecast == self._attr_native_value
+        ):
+            return
+        self._last_update_success = update_success
+        self._attr_native_value = forecast
+        self._async_write_update()
+
+
+@dataclass(frozen=True, kw_only=True)
+class ParkingAggregateSensorDescription(SensorEntityDescription):
+    """Describes a sensor of the capacity totals of a group of parkings."""
+
+    value_fn: Callable[[CapacityTotals], float | None]
+
+
+AGGREGATE_SENSORS = (
+    ParkingAggregateSensorDescription(
+        key="available",
+        name="available spaces",
+        icon="mdi:parking",
+        native_unit_of_measurement="spaces",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: totals.available,
+    ),
+    ParkingAggregateSensorDescription(
+        key="total",
+        name="total spaces",
+        icon="mdi:garage",
+        native_unit_of_measurement="spaces",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: totals.total,
+    ),
+    ParkingAggregateSensorDescription(
+        key="occupancy",
+        name="occupancy",
+        icon="mdi:chart-donut",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda totals: totals.occupancy,
+    ),
+    ParkingAggregateSensorDescription(
+        key="open",
+        name="open parkings",
+        icon="mdi:garage-open",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda totals: totals.open_count,
+    ),
+)
+
+
+class ParkingAggregateSensor(CoordinatorEntity, SensorEntity):
+    """Capacity totals of all parkings of the city or of a single API."""
+
+    entity_description: ParkingAggregateSensorDescription
+
+    def __init__(self, coordinator, scope, description):
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=AGGREGATES_LISTENER)
+        self.entity_description = description
+        self.scope = scope
+        name = "Parking Gent" if scope == AGGREGATE_CITY else scope
+        self._attr_unique_id = f"parking_gent_{scope.lower().replace(' ', '_')}_{description.key}"
+        self._attr_name = f"{name} {description.name}"
+        self._last_update_success = coordinator.last_update_success
+        self._attr_native_value = self._value()
+
+    def _value(self):
+        """Return the value of the current totals of the scope."""
+        totals = self.coordinator.aggregates.get(self.scope)
+        return self.entity_description.value_fn(totals) if totals is not None else None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the total or the coordinator status changed."""
+        update_success = self.coordinator.last_update_success
+        value = self._value()
+        if update_success == self._last_update_success and value == self._attr_native_value:
+            return
+        self._last_update_success = update_success
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class ApiCircuitSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing the circuit breaker state of an API."""
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_options = BREAKER_STATES
+
+    def __init__(self, coordinator, api_name):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.api_name = api_name
+        self._attr_icon = "mdi:api"
+        self._attr_unique_id = f"parking_gent_{api_name.lower().replace(' ', '_')}_circuit"
+        self._attr_name = f"{api_name} API circuit"
+
+    @property
+    def available(self):
+        """Stay available, the breaker state matters most when updates fail."""
+        return True
 
     @property
     def native_value(self):
-        """Return the state of the sensor (available capacity)."""
-        if not self.coordinator.data:
-            return None
-        parking_data = self.coordinator.data.get(self.parking_id, {})
-        return parking_data.get("availableCapacity", 0)
+        """Return the breaker state."""
+        return self.coordinator.breakers[self.api_name].state
+
+    @property
+    def extra_state_attributes(self):
+        """Return the failure count and next retry time."""
+        breaker = self.coordinator.breakers[self.api_name]
+        return {
+            "failures": breaker.failures,
+            "retryAt": breaker.retry_at.isoformat() if breaker.retry_at else None,
+            "lastError": breaker.last_error,
+        }
+
+
+@dataclass(frozen=True, kw_only=True)
+class PipelineMetricSensorDescription(SensorEntityDescription):
+    """Describes a sensor of a rolling metric of the fetch pipeline."""
+
+    metric: str
+    # Statistic of the rolling window shown as state, the percentiles are attributes
+    statistic: str = "p50"
+
+
+SOURCE_METRIC_SENSORS = (
+    PipelineMetricSensorDescription(
+        key="latency",
+        name="latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        metric="latency",
+    ),
+    PipelineMetricSensorDescription(
+        key="ttfb",
+        name="time to first byte",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        metric="ttfb",
+    ),
+    PipelineMetricSensorDescription(
+        key="payload_size",
+        name="payload size",
+        icon="mdi:download-network",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        metric="bytes",
+    ),
+    PipelineMetricSensorDescription(
+        key="decode_time",
+        name="decode time",
+        icon="mdi:code-json",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        metric="decode",
+    ),
+    PipelineMetricSensorDescription(
+        key="normalize_time",
+        name="normalize time",
+        icon="mdi:cog-transfer",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        metric="normalize",
+    ),
+    PipelineMetricSensorDescription(
+        key="success_rate",
+        name="success rate",
+        icon="mdi:check-network",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        metric="success",
+        statistic="mean",
+    ),
+)
+
+CYCLE_METRIC_SENSORS = (
+    PipelineMetricSensorDescription(
+        key="refresh_duration",
+        name="refresh duration",
+        icon="mdi:timer-sync-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        metric="duration",
+    ),
+    PipelineMetricSensorDescription(
+        key="state_writes",
+        name="state writes",
+        icon="mdi:database-edit",
+        state_class=SensorStateClass.MEASUREMENT,
+        metric="state_writes",
+    ),
+)
+
+
+class PipelineMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor of a rolling metric of a source or of the refreshes.
+
+    It listens with the METRICS_LISTENER context, so it is updated after the
+    states written by the refresh have been counted. The summary of the
+    rolling window is computed once per update.
+    """
+
+    entity_description: PipelineMetricSensorDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, scope, description):
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=METRICS_LISTENER)
+        self.entity_description = description
+        self.scope = scope
+        name = "Parking Gent" if scope == METRICS_CYCLE else f"{scope} API"
+        self._attr_unique_id = f"parking_gent_{scope.lower().replace(' ', '_')}_{description.key}"
+        self._attr_name = f"{name} {description.name}"
+        self._update_summary()
+
+    def _update_summary(self) -> None:
+        """Summarize the rolling window of the metric."""
+        self._summary = self.coordinator.metrics.summary(
+            self.scope, self.entity_description.metric
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Summarize the metric once, then write the state."""
+        self._update_summary()
+        super()._handle_coordinator_update()
 
     @property
     def available(self):
-        """Return True if the entity is available."""
-        if not self.coordinator.last_update_success:
-            return False
-        parking_data = self.coordinator.data.get(self.parking_id, {})
-        return bool(parking_data.get("isOpenNow", False))
+        """Stay available, the metrics matter most when updates fail."""
+        return True
+
+    @property
+    def native_value(self):
+        """Return the statistic of the rolling window."""
+        return self._summary.get(self.entity_description.statistic)
 
     @property
     def extra_state_attributes(self):
-        """Return additional attributes."""
-        if not self.coordinator.data:
-            return {}
-            
-        parking_data = self.coordinator.data.get(self.parking_id, {})
-        
-        # Safely extract location data
-        location = parking_data.get("location", {})
-        lat = None
-        lon = None
-        
-        if isinstance(location, dict):
-            lat = location.get("lat")
-            lon = location.get("lon")
-        
+        """Return the percentiles of the rolling window."""
+        summary = self._summary
         return {
-            "isOpenNow": bool(parking_data.get("isOpenNow", False)),
-            "lastUpdate": parking_data.get("lastUpdate"),
-            "location": location,
-            "latitude": lat,
-            "longitude": lon,
-            "occupation": parking_data.get("occupation", 0),
-            "openingTimes": parking_data.get("openingTimes"),
-            "totalCapacity": parking_data.get("totalCapacity", 0),
-            "url": parking_data.get("url"),
+            "p50": summary.get("p50"),
+            "p95": summary.get("p95"),
+            "p99": summary.get("p99"),
+            "samples": summary["samples"],
         }
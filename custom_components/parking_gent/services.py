@@ -0,0 +1,248 @@
+"""Services of the Parking Gent integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_LATITUDE, ATTR_LONGITUDE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .constants import DOMAIN, FORECAST_HORIZON_MINUTES
+
+if TYPE_CHECKING:
+    from .profiler import RefreshProfiler
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_PREDICT = "predict"
+SERVICE_FIND_NEAREST = "find_nearest"
+SERVICE_PROFILE = "profile"
+
+ATTR_CYCLES = "cycles"
+ATTR_LIMIT = "limit"
+ATTR_LOCATIONS = "locations"
+ATTR_MIN_FREE = "min_free"
+ATTR_MINUTES = "minutes"
+ATTR_PARKINGS = "parkings"
+ATTR_RADIUS = "radius"
+ATTR_REFRESH = "refresh"
+
+PREDICT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_MINUTES, default=FORECAST_HORIZON_MINUTES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=7 * 24 * 60)
+        ),
+        vol.Optional(ATTR_PARKINGS): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+FIND_NEAREST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_LOCATIONS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_LATITUDE): cv.latitude,
+                        vol.Required(ATTR_LONGITUDE): cv.longitude,
+                    }
+                )
+            ],
+        ),
+        vol.Optional(ATTR_MIN_FREE, default=1): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(ATTR_LIMIT, default=3): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+        vol.Optional(ATTR_RADIUS): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_REFRESH, default=False): cv.boolean,
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant) -> list:
+    """Return the coordinators of the loaded config entries."""
+    return [
+        entry_data["coordinator"]
+        for entry_data in hass.data.get(DOMAIN, {}).values()
+        if isinstance(entry_data, dict) and "coordinator" in entry_data
+    ]
+
+
+def _origins(hass: HomeAssistant, call: ServiceCall) -> list[dict]:
+    """Return the origins of a find_nearest call, the home location by default."""
+    origins = [
+        {ATTR_LATITUDE: location[ATTR_LATITUDE], ATTR_LONGITUDE: location[ATTR_LONGITUDE]}
+        for location in call.data.get(ATTR_LOCATIONS, [])
+    ]
+    for entity_id in call.data.get(ATTR_ENTITY_ID, []):
+        state = hass.states.get(entity_id)
+        if state is None or ATTR_LATITUDE not in state.attributes:
+            raise ServiceValidationError(f"{entity_id} has no location")
+        origins.append({
+            "entityId": entity_id,
+            ATTR_LATITUDE: state.attributes[ATTR_LATITUDE],
+            ATTR_LONGITUDE: state.attributes[ATTR_LONGITUDE],
+        })
+    if not origins:
+        origins.append({
+            ATTR_LATITUDE: hass.config.latitude,
+            ATTR_LONGITUDE: hass.config.longitude,
+        })
+    return origins
+
+
+async def _async_record_profile(
+    hass: HomeAssistant, profiler: RefreshProfiler, coordinators: list, refresh: bool
+) -> None:
+    """Wait for the profiled cycles, refreshing right away if asked, and write the report."""
+    try:
+        # A scheduled refresh running meanwhile is waited for, cycles never overlap
+        while refresh and not profiler.finished:
+            for coordinator in coordinators:
+                if not profiler.finished:
+                    await coordinator.async_refresh()
+        await profiler.done.wait()
+    finally:
+        for coordinator in coordinators:
+            if coordinator.profiler is profiler:
+                coordinator.profiler = None
+        if not profiler.finished:
+            profiler.abort()
+
+    if profiler.error is not None:
+        _LOGGER.warning("Unable to profile the refresh cycles: %s", profiler.error)
+        persistent_notification.async_create(
+            hass,
+            f"The refresh cycles could not be profiled: {profiler.error}",
+            title="Parking Gent profile",
+            notification_id=f"{DOMAIN}_profile",
+        )
+        return
+
+    path = await hass.async_add_executor_job(profiler.write_report)
+    _LOGGER.info("Profile of %d refresh cycles written to %s", profiler.completed, path)
+    persistent_notification.async_create(
+        hass,
+        f"The profile of {profiler.completed} refresh cycles was written to `{path}`.",
+        title="Parking Gent profile",
+        notification_id=f"{DOMAIN}_profile",
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_predict(call: ServiceCall) -> ServiceResponse:
+        """Predict the available spaces of the tracked parkings."""
+        minutes = call.data[ATTR_MINUTES]
+        parkings = call.data.get(ATTR_PARKINGS)
+        forecasts = {}
+        for coordinator in _coordinators(hass):
+            # A refresh may replace the data while the model predicts
+            data = coordinator.data or {}
+            predictions = await coordinator.async_predict(minutes, parkings)
+            for parking_id, predicted in predictions.items():
+                if (record := data.get(parking_id)) is None:
+                    continue
+                forecasts[parking_id] = {
+                    "availableCapacity": record.available_capacity,
+                    "predictedCapacity": predicted,
+                    "totalCapacity": record.total_capacity,
+                }
+        return {
+            "minutes": minutes,
+            "predictedAt": dt_util.now().isoformat(),
+            "parkings": forecasts,
+        }
+
+    async def async_find_nearest(call: ServiceCall) -> ServiceResponse:
+        """Rank the nearest parkings with enough free spaces per origin."""
+        origins = _origins(hass, call)
+        limit = call.data[ATTR_LIMIT]
+        ranked = [[] for _ in origins]
+        for coordinator in _coordinators(hass):
+            results = await coordinator.async_find_nearest(
+                [(origin[ATTR_LATITUDE], origin[ATTR_LONGITUDE]) for origin in origins],
+                call.data[ATTR_MIN_FREE],
+                limit,
+                call.data.get(ATTR_RADIUS),
+            )
+            for merged, nearest in zip(ranked, results):
+                merged.extend(nearest)
+        for origin, nearest in zip(origins, ranked):
+            nearest.sort(key=lambda result: result[1])
+            origin[ATTR_PARKINGS] = [
+                {
+                    "name": record.name,
+                    "distance": round(distance, 3),
+                    "availableCapacity": record.available_capacity,
+                    "totalCapacity": record.total_capacity,
+                    ATTR_LATITUDE: record.latitude,
+                    ATTR_LONGITUDE: record.longitude,
+                }
+                for record, distance in nearest[:limit]
+            ]
+        return {"origins": origins}
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next refresh cycles into a report in the config directory."""
+        coordinators = _coordinators(hass)
+        if not coordinators:
+            raise ServiceValidationError("No Parking Gent entries are loaded")
+        if any(coordinator.profiler is not None for coordinator in coordinators):
+            raise ServiceValidationError("A profile is already being recorded")
+        # cProfile, pstats and tracemalloc are only loaded when profiling
+        from .profiler import RefreshProfiler
+
+        timestamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+        profiler = RefreshProfiler(
+            call.data[ATTR_CYCLES],
+            hass.config.path(f"{DOMAIN}_profile_{timestamp}.txt.gz"),
+        )
+        for coordinator in coordinators:
+            coordinator.profiler = profiler
+        hass.async_create_background_task(
+            _async_record_profile(hass, profiler, coordinators, call.data[ATTR_REFRESH]),
+            f"{DOMAIN} profile",
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_NEAREST,
+        async_find_nearest,
+        schema=FIND_NEAREST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PREDICT,
+        async_predict,
+        schema=PREDICT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+    )
@@ -0,0 +1,141 @@
+"""Registry of the Stad Gent datasets providing parking data."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .constants import (
+    DATASET_GARAGE,
+    DATASET_MOBI,
+    DATASET_PR,
+    DYNAMIC_FIELDS,
+    FIELDS_GARAGE,
+    FIELDS_MOBI,
+    FIELDS_PR,
+    PARKING_SELECT_MOBI,
+    SOURCE_CONCURRENCY,
+    compose_records_url,
+    compose_where_in,
+)
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True, kw_only=True)
+class ParkingSource:
+    """Describes a dataset of parking locations.
+
+    The name identifies the source in the stored data, the breakers and the
+    entities, so it must stay stable once a source has been released.
+    """
+
+    name: str
+    dataset: str
+    mapping: Mapping[str, str]
+    where: str | None = None
+    documentation_url: str | None = None
+    # Refreshes between two polls of the source, for large or slow datasets
+    poll_cost: int = 1
+    # Sources with a lower priority are polled and listed first
+    priority: int = 0
+    enabled: bool = True
+
+    @property
+    def url(self) -> str:
+        """Return the URL of all records of the source."""
+        return compose_records_url(self.dataset, self.mapping, self.where)
+
+    @property
+    def poll_mapping(self) -> dict[str, str]:
+        """Return the mapping of the fields that change between polls."""
+        return {key: field for key, field in self.mapping.items() if key in DYNAMIC_FIELDS}
+
+
+class SourceRegistry:
+    """The parking sources, shared by discovery, health checks and polling.
+
+    Requests to the sources go through one semaphore of SOURCE_CONCURRENCY
+    slots, so adding datasets never multiplies the concurrent requests.
+    """
+
+    def __init__(self, sources: list[ParkingSource], concurrency: int) -> None:
+        """Initialize the registry."""
+        self._sources = sorted(sources, key=lambda source: source.priority)
+        self._concurrency = concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def __iter__(self) -> Iterator[ParkingSource]:
+        """Iterate over all sources, enabled or not."""
+        return iter(self._sources)
+
+    @property
+    def enabled(self) -> list[ParkingSource]:
+        """Return the enabled sources in priority order."""
+        return [source for source in self._sources if source.enabled]
+
+    @property
+    def limit(self) -> asyncio.Semaphore:
+        """Return the semaphore bounding the concurrent source requests."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        return self._semaphore
+
+    async def async_gather(
+        self, job: Callable[[ParkingSource], Awaitable[_T]]
+    ) -> list[_T | BaseException]:
+        """Run a job for every enabled source within the concurrency limit.
+
+        Results are returned in priority order; a failing job returns its
+        exception instead of cancelling the others.
+        """
+
+        async def run(source: ParkingSource) -> _T:
+            async with self.limit:
+                return await job(source)
+
+        return await asyncio.gather(
+            *(run(source) for source in self.enabled), return_exceptions=True
+        )
+
+
+# Requests only fetch a subset of the relevant data, more documentation via the url
+SOURCES = SourceRegistry(
+    [
+        ParkingSource(
+            name="Parking Garages",
+            dataset=DATASET_GARAGE,
+            mapping=FIELDS_GARAGE,
+            documentation_url="https://data.stad.gent/explore/dataset/bezetting-parkeergarages-real-time/information/?sort=-occupation",
+        ),
+        ParkingSource(
+            name="P+R Parking",
+            dataset=DATASET_PR,
+            mapping=FIELDS_PR,
+            documentation_url="https://data.stad.gent/explore/dataset/real-time-bezetting-pr-gent/information/?sort=name",
+            priority=1,
+            # Temporarily disabled, the City of Gent API answers 404 Not Found;
+            # to be enabled again once the endpoint is fixed
+            enabled=False,
+        ),
+        # The mobi endpoint is only used for 3 extra parking locations from
+        # Interparking that are not available in the garage or P+R endpoints
+        ParkingSource(
+            name="Mobi Parkings",
+            dataset=DATASET_MOBI,
+            mapping=FIELDS_MOBI,
+            where=(
+                f'{FIELDS_MOBI["totalCapacity"]} > 0 and '
+                f'{compose_where_in(FIELDS_MOBI["name"], PARKING_SELECT_MOBI)}'
+            ),
+            documentation_url="https://data.stad.gent/explore/dataset/mobi-parkings/information/",
+            priority=2,
+            # Not polled, as before the source registry: a request every
+            # refresh for 3 locations; enable it to track them as well
+            enabled=False,
+        ),
+    ],
+    SOURCE_CONCURRENCY,
+)
@@ -0,0 +1,125 @@
+"""Spatial index of the parking locations for nearest-parking queries."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Container, Mapping, Sequence
+
+import numpy as np
+
+from .constants import GRID_CELL_DEGREES
+from .models import ParkingRecord
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.2  # of latitude
+
+
+def haversine_km(origins: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Return the (origins, targets) matrix of great-circle distances.
+
+    Both arguments are arrays of (latitude, longitude) rows in radians.
+    """
+    lat1 = origins[:, 0, np.newaxis]
+    lon1 = origins[:, 1, np.newaxis]
+    lat2 = targets[np.newaxis, :, 0]
+    lon2 = targets[np.newaxis, :, 1]
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class ParkingIndex:
+    """Grid index of the parking locations.
+
+    Locations are bucketed in GRID_CELL_DEGREES cells, so a query with a
+    radius only measures the parkings of the cells around its origins.
+    The index holds no availability and only has to be rebuilt when a
+    parking is added, removed or moved.
+    """
+
+    def __init__(self, records: Mapping[str, ParkingRecord]) -> None:
+        """Build the index of the records that have a location."""
+        located = [
+            record for record in records.values()
+            if record.latitude is not None and record.longitude is not None
+        ]
+        self.parking_ids = [record.name for record in located]
+        degrees = np.array(
+            [(record.latitude, record.longitude) for record in located], dtype=float
+        ).reshape(-1, 2)
+        self._coordinates = np.radians(degrees)
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        cells = np.floor(degrees / GRID_CELL_DEGREES).astype(int).tolist()
+        for position, (row, column) in enumerate(cells):
+            self._cells.setdefault((row, column), []).append(position)
+
+    def __len__(self) -> int:
+        """Return the number of indexed parkings."""
+        return len(self.parking_ids)
+
+    def _candidates(self, origins: np.ndarray, radius_km: float | None) -> np.ndarray:
+        """Return the positions of the parkings in the cells near the origins."""
+        if radius_km is None:
+            return np.arange(len(self.parking_ids))
+        positions = set()
+        radius_degrees = radius_km / KM_PER_DEGREE
+        lat_rings = math.ceil(radius_degrees / GRID_CELL_DEGREES)
+        for latitude, longitude in origins.tolist():
+            # Cells narrow towards the poles, widen the longitude search to match
+            widest = math.cos(math.radians(min(abs(latitude) + radius_degrees, 89.0)))
+            lon_rings = math.ceil(radius_degrees / widest / GRID_CELL_DEGREES)
+            row = math.floor(latitude / GRID_CELL_DEGREES)
+            column = math.floor(longitude / GRID_CELL_DEGREES)
+            for cell_row in range(row - lat_rings, row + lat_rings + 1):
+                for cell_column in range(column - lon_rings, column + lon_rings + 1):
+                    positions.update(self._cells.get((cell_row, cell_column), ()))
+        return np.fromiter(sorted(positions), dtype=np.intp, count=len(positions))
+
+    def nearest(
+        self,
+        origins: Sequence[tuple[float, float]],
+        eligible: Container[str],
+        limit: int,
+        radius_km: float | None = None,
+    ) -> list[list[tuple[str, float]]]:
+        """Rank the eligible parkings by distance for every origin.
+
+        origins are (latitude, longitude) pairs in degrees; eligible holds
+        the parking ids that may be returned. Returns, per origin, up to
+        limit (parking id, distance in km) pairs, nearest first, computed
+        for all origins in one vectorized haversine.
+        """
+        if not origins:
+            return []
+        origin_degrees = np.array(origins, dtype=float).reshape(-1, 2)
+        candidates = np.fromiter(
+            (
+                position
+                for position in self._candidates(origin_degrees, radius_km).tolist()
+                if self.parking_ids[position] in eligible
+            ),
+            dtype=np.intp,
+        )
+        if not len(candidates):
+            return [[] for _ in origins]
+
+        distances = haversine_km(np.radians(origin_degrees), self._coordinates[candidates])
+        if radius_km is not None:
+            distances[distances > radius_km] = np.inf
+        count = min(limit, len(candidates))
+        nearest = np.argpartition(distances, count - 1, axis=1)[:, :count]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+
+        return [
+            [
+                (self.parking_ids[candidates[column]], distance)
+                for column, distance in zip(columns, row_distances)
+                if distance != math.inf
+            ]
+            for columns, row_distances in zip(nearest.tolist(), nearest_distances.tolist())
+        ]
@@ -0,0 +1,151 @@
+"""Persistent storage of the last known Parking Gent data."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .aggregates import CapacityTotals
+from .constants import DOMAIN
+from .history import OccupancyHistory
+from .models import ParkingRecord
+
+if TYPE_CHECKING:
+    # Imports numpy, the model is only decoded when the coordinator needs it
+    from .forecast import OccupancyForecaster
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60  # seconds, coalesces the saves of consecutive refreshes
+
+# Column order of the stored records, shared by every source
+SNAPSHOT_FIELDS = list(ParkingRecord.__slots__)
+
+
+class ParkingGentStore:
+    """Save and load the normalized coordinator data of a config entry.
+
+    Records are stored per API as rows of values in SNAPSHOT_FIELDS order,
+    which keeps the file compact compared to one dict per record.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._sources: Mapping[str, Mapping[str, ParkingRecord]] = {}
+        self._histories: Mapping[str, OccupancyHistory] = {}
+        self._forecaster: OccupancyForecaster | None = None
+        self._forecast_state: dict[str, Any] | None = None
+        self._metadata_fetched: Mapping[str, datetime] = {}
+        self._totals: Mapping[str, CapacityTotals] = {}
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the stored snapshot.
+
+        Returns a dict with the records per API under "sources", the
+        occupancy histories under "histories", the stored forecast model
+        under "forecast", the time the metadata of each API was fetched under
+        "metadata_fetched", the capacity totals queried per API under
+        "totals" and the time of the save under "saved_at", or None when
+        nothing usable is stored.
+        """
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.warning("Failed to load stored parking data: %s", err)
+            return None
+        if not stored or stored.get("fields") != SNAPSHOT_FIELDS:
+            return None
+
+        try:
+            name_index = SNAPSHOT_FIELDS.index("name")
+            sources = {
+                api_name: {row[name_index]: ParkingRecord.from_row(row) for row in rows}
+                for api_name, rows in stored.get("sources", {}).items()
+            }
+            histories = {
+                parking_id: OccupancyHistory.from_dict(history)
+                for parking_id, history in stored.get("histories", {}).items()
+            }
+            metadata_fetched = {
+                api_name: fetched
+                for api_name, value in stored.get("metadata_fetched", {}).items()
+                if (fetched := dt_util.parse_datetime(value)) is not None
+            }
+            totals = {
+                api_name: CapacityTotals(*row)
+                for api_name, row in stored.get("totals", {}).items()
+            }
+            saved_at = dt_util.parse_datetime(stored.get("saved_at") or "")
+        except (AttributeError, TypeError, ValueError, KeyError, IndexError) as err:
+            _LOGGER.warning("Failed to decode stored parking data: %s", err)
+            return None
+        self._forecast_state = stored.get("forecast")
+        return {
+            "saved_at": saved_at,
+            "sources": sources,
+            "histories": histories,
+            "forecast": self._forecast_state,
+            "metadata_fetched": metadata_fetched,
+            "totals": totals,
+        }
+
+    @callback
+    def async_schedule_save(
+        self,
+        sources: Mapping[str, Mapping[str, ParkingRecord]],
+        histories: Mapping[str, OccupancyHistory],
+        forecaster: OccupancyForecaster | None = None,
+        metadata_fetched: Mapping[str, datetime] | None = None,
+        totals: Mapping[str, CapacityTotals] | None = None,
+    ) -> None:
+        """Save the records per API, histories and forecast after SAVE_DELAY seconds.
+
+        Without a forecaster, the forecast model loaded from the store is kept.
+        """
+        self._sources = sources
+        self._histories = histories
+        self._forecaster = forecaster
+        self._metadata_fetched = metadata_fetched or {}
+        self._totals = totals or {}
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the stored snapshot."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot in its stored format."""
+        data = {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "fields": SNAPSHOT_FIELDS,
+            "sources": {
+                api_name: [record.to_row() for record in records.values()]
+                for api_name, records in self._sources.items()
+            },
+            "histories": {
+                parking_id: history.as_dict()
+                for parking_id, history in self._histories.items()
+            },
+            "metadata_fetched": {
+                api_name: fetched.isoformat()
+                for api_name, fetched in self._metadata_fetched.items()
+            },
+            "totals": {
+                api_name: list(totals.as_tuple())
+                for api_name, totals in self._totals.items()
+            },
+        }
+        if self._forecaster is not None:
+            data["forecast"] = self._forecaster.as_dict()
+        elif self._forecast_state is not None:
+            data["forecast"] = self._forecast_state
+        return data
@@ -0,0 +1,127 @@
+"""Benchmark the compiled record normalizer against the generic mapping loop."""
+
+import logging
+import os
+import random
+import sys
+import timeit
+
+# Add the repository root to the path so the integration imports as a package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from custom_components.parking_gent.constants import FIELDS_GARAGE
+from custom_components.parking_gent.models import ParkingRecord
+from custom_components.parking_gent.normalizer import compile_normalizer
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
+
+RECORD_COUNT = 10_000
+REPEAT = 5
+
+
+def legacy_normalize_record(record, mapping):
+    """Generic mapping loop the coordinator used before compiled normalizers."""
+    normalized = {}
+    for target_key, source_key in mapping.items():
+        value = record.get(source_key)
+        if value is not None:
+            normalized[target_key] = value
+        else:
+            # Set default values for critical fields
+            if target_key == "availableCapacity":
+                normalized[target_key] = 0
+            elif target_key == "isOpenNow":
+                normalized[target_key] = False
+            elif target_key == "totalCapacity":
+                normalized[target_key] = 0
+            elif target_key == "occupation":
+                normalized[target_key] = 0
+            else:
+                normalized[target_key] = None
+
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Missing field '%s' in record, using default value", source_key)
+
+    location = normalized["location"]
+    if not isinstance(location, dict):
+        location = {}
+
+    return ParkingRecord(
+        name=normalized["name"],
+        available_capacity=normalized["availableCapacity"],
+        is_open_now=bool(normalized["isOpenNow"]),
+        last_update=normalized["lastUpdate"],
+        latitude=location.get("lat"),
+        longitude=location.get("lon"),
+        occupation=normalized["occupation"],
+        opening_times=normalized["openingTimes"],
+        total_capacity=normalized["totalCapacity"],
+        url=normalized["url"],
+    )
+
+
+def synthetic_records(count, missing_ratio=0.05):
+    """Generate raw garage records, some of them with missing values."""
+    rng = random.Random(42)
+    records = []
+    for index in range(count):
+        total = rng.randint(100, 1500)
+        available = rng.randint(0, total)
+        record = {
+            "name": f"Parking {index}",
+            "availablecapacity": available,
+            "isopennow": rng.randint(0, 1),
+            "lastupdate": "2025-01-01T12:00:00+01:00",
+            "location": {"lat": 51.0 + rng.random() / 10, "lon": 3.7 + rng.random() / 10},
+            "occupation": round(100 * (total - available) / total),
+            "openingtimesdescription": "24/7",
+            "totalcapacity": total,
+            "urllinkaddress": f"https://stad.gent/parking/{index}",
+        }
+        for field in FIELDS_GARAGE.values():
+            if field != "name" and rng.random() < missing_ratio:
+                record[field] = None
+        records.append(record)
+    return records
+
+
+def main():
+    """Run the benchmark."""
+    records = synthetic_records(RECORD_COUNT)
+    normalize = compile_normalizer(FIELDS_GARAGE)
+
+    # Both implementations must agree before their speed is compared
+    mismatches = sum(
+        1
+        for record in records
+        if normalize(record) != legacy_normalize_record(record, FIELDS_GARAGE)
+    )
+    if mismatches:
+        _LOGGER.error("❌ %d records normalize differently", mismatches)
+        sys.exit(1)
+
+    legacy = min(
+        timeit.repeat(
+            lambda: [legacy_normalize_record(record, FIELDS_GARAGE) for record in records],
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+    compiled = min(
+        timeit.repeat(
+            lambda: [normalize(record) for record in records],
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+
+    _LOGGER.info("📊 Normalizing %d records (best of %d runs):", RECORD_COUNT, REPEAT)
+    _LOGGER.info("  - generic mapping loop: %.1f ms (%.0f records/s)", legacy * 1000, RECORD_COUNT / legacy)
+    _LOGGER.info("  - compiled normalizer:  %.1f ms (%.0f records/s)", compiled * 1000, RECORD_COUNT / compiled)
+    _LOGGER.info("🚀 Speedup: %.2fx", legacy / compiled)
+
+
+if __name__ == "__main__":
+    main()
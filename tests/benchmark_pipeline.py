@@ -0,0 +1,276 @@
+"""Benchmark the fetch -> normalize -> entity update pipeline offline.
+
+Every stage of a coordinator refresh is timed for payloads of 10, 100 and
+10k parkings, generated from the ODS response fixture in tests/fixtures:
+
+- decode: parsing the JSON body of a records page
+- normalize: turning raw records into ParkingRecords
+- merge: diffing the new snapshot and updating the aggregate totals
+- attributes: rebuilding the state attributes of the changed parkings
+- state writes: notifying the entities, which write the changed states
+
+Each run is appended to a history file and compared with the median of
+the previous runs, so regressions are caught without the live API.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Add the repository root to the path so the integration imports as a package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity, entity_registry as er, translation
+from homeassistant.helpers.entity_platform import EntityPlatform
+
+from custom_components.parking_gent.constants import DYNAMIC_FIELDS, FIELDS_GARAGE, SCAN_INTERVAL
+from custom_components.parking_gent.coordinator import ParkingGentCoordinator
+from custom_components.parking_gent.normalizer import compile_normalizer
+from custom_components.parking_gent.sensor import ParkingSensor
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "bezetting-parkeergarages-real-time.json")
+HISTORY = os.path.join(os.path.dirname(__file__), "benchmark_history.jsonl")
+
+SIZES = (10, 100, 10_000)
+STAGES = ("decode", "normalize", "merge", "attributes", "state_writes")
+CHANGED_RATIO = 0.1  # share of the parkings changing between two polls
+REPEAT = 10
+REGRESSION_THRESHOLD = 1.5  # slower than 150% of the median of the history
+REGRESSION_MIN_DELTA = 0.05  # ms, smaller differences are timer noise
+# Polls select only the dynamic fields, the first payload is the metadata
+POLL_FIELDS = {field for key, field in FIELDS_GARAGE.items() if key in DYNAMIC_FIELDS}
+
+
+def scaled_payload(count, seed=42):
+    """Return an ODS records payload of count parkings based on the fixture."""
+    with open(FIXTURE, encoding="utf-8") as fixture:
+        templates = json.load(fixture)["results"]
+    rng = random.Random(seed)
+    results = []
+    for index in range(count):
+        record = dict(templates[index % len(templates)])
+        total = record["totalcapacity"]
+        available = rng.randint(0, total)
+        record["name"] = f"{record['name']} {index}" if count > len(templates) else record["name"]
+        record["availablecapacity"] = available
+        record["occupation"] = round(100 * (total - available) / total)
+        record["location"] = {
+            "lat": record["location"]["lat"] + rng.uniform(-0.05, 0.05),
+            "lon": record["location"]["lon"] + rng.uniform(-0.05, 0.05),
+        }
+        results.append(record)
+    return {"total_count": count, "results": results}
+
+
+def next_poll(payload, seed=7):
+    """Return the payload of the next poll, with CHANGED_RATIO of the parkings changed.
+
+    Like the polls of the coordinator, it only carries the POLL_FIELDS.
+    """
+    rng = random.Random(seed)
+    results = [dict(record) for record in payload["results"]]
+    for record in rng.sample(results, max(1, int(len(results) * CHANGED_RATIO))):
+        record["availablecapacity"] = rng.randint(0, record["totalcapacity"])
+        record["lastupdate"] = "2025-03-14T10:30:00+01:00"
+    results = [{field: record[field] for field in POLL_FIELDS} for record in results]
+    return {"total_count": payload["total_count"], "results": results}
+
+
+def best_of(measure):
+    """Return the fastest of REPEAT runs of measure, in milliseconds."""
+    timings = []
+    for _ in range(REPEAT):
+        timings.append(measure())
+    return min(timings) * 1000
+
+
+async def async_setup_hass(config_dir):
+    """Create a minimal Home Assistant instance to host the entities."""
+    hass = HomeAssistant(config_dir)
+    entity.async_setup(hass)
+    translation.async_setup(hass)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    return hass
+
+
+async def benchmark_size(hass, count):
+    """Time every pipeline stage for a payload of count parkings."""
+    normalize = compile_normalizer(FIELDS_GARAGE)
+    first = json.dumps(scaled_payload(count)).encode()
+    second = json.dumps(next_poll(json.loads(first))).encode()
+    results = {}
+
+    def timed(func):
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
+
+    def snapshot(body):
+        return {record.name: record for record in map(normalize, json.loads(body)["results"])}
+
+    metadata = snapshot(first)
+    results["decode"] = best_of(lambda: timed(lambda: json.loads(second)))
+    records = json.loads(second)["results"]
+    results["normalize"] = best_of(
+        lambda: timed(lambda: [normalize(record, metadata) for record in records])
+    )
+
+    coordinator = ParkingGentCoordinator(hass, store=None)
+    source = coordinator._sources[0].name
+    platform_ = EntityPlatform(
+        hass=hass,
+        logger=_LOGGER,
+        domain="sensor",
+        platform_name="parking_gent",
+        platform=None,
+        scan_interval=SCAN_INTERVAL,
+        entity_namespace=None,
+    )
+
+    def load(data):
+        coordinator._source_data[source] = data
+        coordinator._diff_snapshot(data)
+        coordinator._update_totals(data)
+        coordinator._update_attributes(data)
+        coordinator.data = data
+
+    load(metadata)
+    await platform_.async_add_entities(
+        [ParkingSensor(coordinator, parking_id) for parking_id in coordinator.data]
+    )
+    previous = coordinator.data
+    # Merge the second poll like a refresh does, sharing the unchanged records
+    data = {}
+    for record in json.loads(second)["results"]:
+        coordinator._add_record(data, record, normalize, source, metadata)
+
+    merge, attributes, writes = [], [], []
+    for _ in range(REPEAT):
+        # Start every run from the first poll so each one sees the same changes
+        load(previous)
+        coordinator.async_update_listeners()
+        coordinator._source_data[source] = data
+        merge.append(timed(lambda: (coordinator._diff_snapshot(data), coordinator._update_totals(data))))
+        attributes.append(timed(lambda: coordinator._update_attributes(data)))
+        coordinator.data = data
+        writes.append(timed(coordinator.async_update_listeners))
+
+    results["merge"] = min(merge) * 1000
+    results["attributes"] = min(attributes) * 1000
+    results["state_writes"] = min(writes) * 1000
+    results["changed"] = len(coordinator.changed_parkings)
+
+    await platform_.async_reset()
+    return results
+
+
+def git_revision():
+    """Return the current commit of the repository, if any."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path):
+    """Return the previous runs of the benchmark on this machine."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as history:
+        runs = [json.loads(line) for line in history if line.strip()]
+    return [run for run in runs if run.get("machine") == platform.node()]
+
+
+def find_regressions(results, history, threshold):
+    """Compare results with the median of previous runs of each stage and size."""
+    regressions = []
+    for size, stages in results.items():
+        for stage in STAGES:
+            previous = [
+                run["results"][size][stage]
+                for run in history
+                if stage in run["results"].get(size, {})
+            ]
+            if not previous:
+                continue
+            baseline = statistics.median(previous)
+            if (
+                stages[stage] > baseline * threshold
+                and stages[stage] - baseline > REGRESSION_MIN_DELTA
+            ):
+                regressions.append((size, stage, stages[stage], baseline))
+    return regressions
+
+
+async def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", default=HISTORY, help="history file of previous runs")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--no-save", action="store_true", help="do not record this run")
+    args = parser.parse_args()
+
+    # Keep the entity registration and debug logging out of the output and timings
+    logging.getLogger("homeassistant").setLevel(logging.WARNING)
+    logging.getLogger("custom_components.parking_gent").setLevel(logging.WARNING)
+    hass = await async_setup_hass(tempfile.mkdtemp())
+    results = {}
+    try:
+        for count in SIZES:
+            results[str(count)] = await benchmark_size(hass, count)
+    finally:
+        await hass.async_stop(force=True)
+
+    _LOGGER.info("📊 Pipeline stages, best of %d runs (ms):", REPEAT)
+    _LOGGER.info("  %-8s %s", "parkings", " ".join(f"{stage:>12}" for stage in STAGES))
+    for size, stages in results.items():
+        _LOGGER.info("  %-8s %s", size, " ".join(f"{stages[stage]:12.3f}" for stage in STAGES))
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, args.threshold)
+
+    if not args.no_save:
+        with open(args.history, "a", encoding="utf-8") as output:
+            output.write(json.dumps({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "revision": git_revision(),
+                "machine": platform.node(),
+                "python": platform.python_version(),
+                "results": results,
+            }) + "\n")
+
+    if not history:
+        _LOGGER.info("ℹ️ No previous runs on this machine, this run is the baseline")
+    elif regressions:
+        for size, stage, duration, baseline in regressions:
+            _LOGGER.error(
+                "❌ %s with %s parkings: %.3f ms, median of previous runs %.3f ms",
+                stage, size, duration, baseline,
+            )
+        sys.exit(1)
+    else:
+        _LOGGER.info("✅ No regressions compared with %d previous run(s)", len(history))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
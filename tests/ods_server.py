@@ -0,0 +1,469 @@
+"""Local stand-in for the Opendatasoft records API of data.stad.gent.
+
+Serves the parking datasets from the fixtures in tests/fixtures, or from
+generated data, with the parts of the Explore v2.1 records endpoint the
+integration uses: select (including sum/count aggregates and group_by),
+where, limit and offset. Latency, 404/500 errors, truncated bodies and
+ETag/Last-Modified revalidation can be configured to test performance and
+resilience offline.
+
+Start the server and point the integration at it:
+
+    python tests/ods_server.py --port 8080 --latency 0.2 --error-500 0.1
+    PARKING_GENT_API_URL=http://localhost:8080/api/explore hass -c config
+"""
+
+import argparse
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from aiohttp import web
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+DATASETS = ("bezetting-parkeergarages-real-time", "real-time-bezetting-pr-gent")
+RECORDS_PATH = "/api/explore/v2.1/catalog/datasets/{dataset}/records"
+
+# Field names of the capacities per dataset, used to generate data and publishes
+CAPACITY_FIELDS = {
+    "bezetting-parkeergarages-real-time": ("availablecapacity", "totalcapacity"),
+    "real-time-bezetting-pr-gent": ("availablespaces", "numberofspaces"),
+}
+
+MAX_LIMIT = 100
+MAX_OFFSET = 10000
+DEFAULT_LIMIT = 10
+
+
+@dataclass
+class ServerOptions:
+    """Behaviour of the stand-in server."""
+
+    parkings: int | None = None  # generate this many parkings per dataset
+    latency: float = 0.0  # seconds added to every response
+    jitter: float = 0.0  # random extra latency, up to this many seconds
+    error_404: float = 0.0  # share of requests answered 404 Not Found
+    error_500: float = 0.0  # share of requests answered 500 Internal Server Error
+    truncate: float = 0.0  # share of bodies cut off halfway
+    publish_interval: float | None = None  # seconds between data updates
+    etag: bool = True  # send ETag/Last-Modified and answer 304 when unchanged
+    seed: int | None = None
+
+
+class WhereClause:
+    """Parser and evaluator of the ODSQL where subset used by the integration.
+
+    Supports comparisons (=, !=, <, <=, >, >=), IN lists, and/or/not and
+    parentheses, with double or single quoted strings and numbers.
+    """
+
+    TOKEN = re.compile(
+        r"\s*(?:(?P<number>-?\d+(?:\.\d+)?)|\"(?P<dstring>[^\"]*)\"|'(?P<sstring>[^']*)'"
+        r"|(?P<op>!=|<=|>=|=|<|>|\(|\)|,)|(?P<word>[A-Za-z_][A-Za-z0-9_.]*))"
+    )
+
+    def __init__(self, text):
+        """Parse the clause."""
+        self._tokens = self._tokenize(text)
+        self._position = 0
+        self._tree = self._or()
+        if self._position != len(self._tokens):
+            raise ValueError(f"Unexpected token {self._tokens[self._position][1]!r}")
+
+    def _tokenize(self, text):
+        tokens = []
+        position = 0
+        text = text.strip()
+        while position < len(text):
+            match = self.TOKEN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(f"Invalid where clause near {text[position:]!r}")
+            position = match.end()
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "number":
+                tokens.append(("value", float(value) if "." in value else int(value)))
+            elif kind in ("dstring", "sstring"):
+                tokens.append(("value", value))
+            elif kind == "word" and value.lower() in ("and", "or", "not", "in"):
+                tokens.append(("keyword", value.lower()))
+            else:
+                tokens.append((kind, value))
+        return tokens
+
+    def _peek(self):
+        return self._tokens[self._position] if self._position < len(self._tokens) else (None, None)
+
+    def _take(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            raise ValueError(f"Expected {value or kind}, got {token[1]!r}")
+        self._position += 1
+        return token[1]
+
+    def _or(self):
+        node = self._and()
+        while self._peek() == ("keyword", "or"):
+            self._take()
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self):
+        node = self._not()
+        while self._peek() == ("keyword", "and"):
+            self._take()
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self):
+        if self._peek() == ("keyword", "not"):
+            self._take()
+            return ("not", self._not())
+        if self._peek() == ("op", "("):
+            self._take()
+            node = self._or()
+            self._take("op", ")")
+            return node
+        return self._comparison()
+
+    def _comparison(self):
+        field = self._take("word")
+        if self._peek() == ("keyword", "in"):
+            self._take()
+            self._take("op", "(")
+            values = [self._take("value")]
+            while self._peek() == ("op", ","):
+                self._take()
+                values.append(self._take("value"))
+            self._take("op", ")")
+            return ("in", field, values)
+        operator = self._take("op")
+        if operator not in ("=", "!=", "<", "<=", ">", ">="):
+            raise ValueError(f"Unsupported operator {operator!r}")
+        return (operator, field, self._take("value"))
+
+    def matches(self, record):
+        """Return True when the record satisfies the clause."""
+        return self._evaluate(self._tree, record)
+
+    def _evaluate(self, node, record):
+        kind = node[0]
+        if kind == "and":
+            return self._evaluate(node[1], record) and self._evaluate(node[2], record)
+        if kind == "or":
+            return self._evaluate(node[1], record) or self._evaluate(node[2], record)
+        if kind == "not":
+            return not self._evaluate(node[1], record)
+        value = record.get(node[1])
+        if kind == "in":
+            return value in node[2]
+        if value is None:
+            return False
+        try:
+            return {
+                "=": value == node[2],
+                "!=": value != node[2],
+                "<": value < node[2],
+                "<=": value <= node[2],
+                ">": value > node[2],
+                ">=": value >= node[2],
+            }[kind]
+        except TypeError:
+            return False
+
+
+SELECT_ITEM = re.compile(
+    r"^\s*(?:(?P<function>sum|count|avg|min|max)\((?P<argument>[^)]*)\)|(?P<field>[A-Za-z_][A-Za-z0-9_]*))"
+    r"(?:\s+as\s+(?P<alias>[A-Za-z_][A-Za-z0-9_]*))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_select(text):
+    """Return the (function, field, alias) items of a select parameter."""
+    items = []
+    for part in text.split(","):
+        match = SELECT_ITEM.match(part)
+        if not match:
+            raise ValueError(f"Invalid select expression {part.strip()!r}")
+        if match["function"]:
+            function = match["function"].lower()
+            argument = match["argument"].strip()
+            items.append((function, argument, match["alias"] or f"{function}({argument})"))
+        else:
+            items.append((None, match["field"], match["alias"] or match["field"]))
+    return items
+
+
+def aggregate(records, items, group_by):
+    """Return the aggregated rows of records, one per group_by value."""
+    groups = {}
+    for record in records:
+        key = tuple(record.get(field) for field in group_by)
+        groups.setdefault(key, []).append(record)
+    if not group_by and not groups:
+        groups[()] = []
+
+    rows = []
+    for key, members in groups.items():
+        row = dict(zip(group_by, key))
+        for function, argument, alias in items:
+            if function is None:
+                row[alias] = members[0].get(argument) if members else None
+                continue
+            values = [record.get(argument) for record in members if record.get(argument) is not None]
+            if function == "count":
+                row[alias] = len(members) if argument == "*" else len(values)
+            elif not values:
+                row[alias] = None
+            elif function == "sum":
+                row[alias] = sum(values)
+            elif function == "avg":
+                row[alias] = sum(values) / len(values)
+            elif function == "min":
+                row[alias] = min(values)
+            else:
+                row[alias] = max(values)
+        rows.append(row)
+    return rows
+
+
+def generate_records(template, count, available_field, total_field, rng):
+    """Generate count records modeled on the template records of a fixture."""
+    records = []
+    for index in range(count):
+        record = copy.deepcopy(template[index % len(template)])
+        if count > len(template):
+            record["name"] = f"{record['name']} {index}"
+        total = record[total_field]
+        record[available_field] = rng.randint(0, total)
+        record["occupation"] = round(100 * (total - record[available_field]) / total)
+        record["location"] = {
+            "lat": record["location"]["lat"] + rng.uniform(-0.05, 0.05),
+            "lon": record["location"]["lon"] + rng.uniform(-0.05, 0.05),
+        }
+        records.append(record)
+    return records
+
+
+class Dataset:
+    """Records of a dataset and the time they last changed."""
+
+    def __init__(self, name, records):
+        """Initialize the dataset."""
+        self.name = name
+        self.records = records
+        self.modified = datetime.now(timezone.utc).replace(microsecond=0)
+
+    def publish(self, rng, share=0.3):
+        """Change the availability of a share of the parkings, like a new publish."""
+        available_field, total_field = CAPACITY_FIELDS[self.name]
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        for record in rng.sample(self.records, max(1, int(len(self.records) * share))):
+            total = record[total_field]
+            record[available_field] = max(0, min(total, record[available_field] + rng.randint(-25, 25)))
+            record["occupation"] = round(100 * (total - record[available_field]) / total)
+            record["lastupdate"] = now.isoformat()
+        # Last-Modified has a resolution of a second, never reuse one
+        self.modified = max(now, self.modified + timedelta(seconds=1))
+
+
+def load_datasets(options, rng):
+    """Load the fixture of every dataset, scaled to options.parkings if set."""
+    datasets = {}
+    for name in DATASETS:
+        with open(os.path.join(FIXTURES, f"{name}.json"), encoding="utf-8") as fixture:
+            records = json.load(fixture)["results"]
+        if options.parkings:
+            records = generate_records(records, options.parkings, *CAPACITY_FIELDS[name], rng)
+        datasets[name] = Dataset(name, records)
+    return datasets
+
+
+def error_response(status, error_code, message):
+    """Return an error in the format of the ODS API."""
+    return web.json_response({"error_code": error_code, "message": message}, status=status)
+
+
+def query_records(dataset, query):
+    """Answer a records query, raising ValueError for invalid parameters."""
+    limit = int(query.get("limit", DEFAULT_LIMIT))
+    offset = int(query.get("offset", 0))
+    if not 0 <= limit <= MAX_LIMIT:
+        raise ValueError(f"Invalid value for limit: must be between 0 and {MAX_LIMIT}")
+    if offset < 0 or offset + limit > MAX_OFFSET:
+        raise ValueError(f"Invalid value for offset: offset + limit must be at most {MAX_OFFSET}")
+
+    records = dataset.records
+    if query.get("where"):
+        clause = WhereClause(query["where"])
+        records = [record for record in records if clause.matches(record)]
+
+    items = parse_select(query["select"]) if query.get("select") else None
+    group_by = [field.strip() for field in query["group_by"].split(",")] if query.get("group_by") else []
+    if group_by or (items and any(function for function, _, _ in items)):
+        rows = aggregate(records, items or [], group_by)
+        return {"results": rows[offset:offset + limit]}
+
+    page = records[offset:offset + limit]
+    if items:
+        page = [{alias: record.get(field) for _, field, alias in items} for record in page]
+    return {"total_count": len(records), "results": page}
+
+
+@web.middleware
+async def inject_faults(request, handler):
+    """Delay responses and answer a share of the requests with errors."""
+    options = request.app["options"]
+    rng = request.app["rng"]
+    delay = options.latency + rng.uniform(0, options.jitter)
+    if delay:
+        await asyncio.sleep(delay)
+    roll = rng.random()
+    if roll < options.error_404:
+        response = error_response(404, "NotFound", "Unknown dataset")
+    elif roll < options.error_404 + options.error_500:
+        response = error_response(500, "InternalServerError", "Injected failure")
+    else:
+        response = await handler(request)
+    request.app["stats"][response.status] += 1
+    _LOGGER.debug("%s %s -> %s", request.method, request.path_qs, response.status)
+    return response
+
+
+async def handle_records(request):
+    """Serve the records endpoint of a dataset."""
+    app = request.app
+    options = app["options"]
+    dataset = app["datasets"].get(request.match_info["dataset"])
+    if dataset is None:
+        return error_response(404, "NotFound", f"Unknown dataset: {request.match_info['dataset']}")
+    try:
+        payload = query_records(dataset, request.query)
+    except (KeyError, TypeError, ValueError) as err:
+        return error_response(400, "ODSQLError", str(err))
+
+    body = json.dumps(payload, ensure_ascii=False).encode()
+    headers = {}
+    if options.etag:
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        headers = {"ETag": etag, "Last-Modified": format_datetime(dataset.modified, usegmt=True)}
+        if_none_match = request.headers.get("If-None-Match")
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_none_match is not None:
+            not_modified = etag in [tag.strip() for tag in if_none_match.split(",")]
+        elif if_modified_since is not None:
+            try:
+                not_modified = dataset.modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                not_modified = False
+        else:
+            not_modified = False
+        if not_modified:
+            return web.Response(status=304, headers=headers)
+
+    if app["rng"].random() < options.truncate:
+        # Promise the full body but drop the connection halfway
+        response = web.StreamResponse(headers=headers)
+        response.content_type = "application/json"
+        response.content_length = len(body)
+        await response.prepare(request)
+        await response.write(body[: len(body) // 2])
+        request.transport.close()
+        return response
+
+    response = web.Response(body=body, content_type="application/json", headers=headers)
+    response.enable_compression()
+    return response
+
+
+async def publish_updates(app):
+    """Publish new availability every publish_interval seconds."""
+    options = app["options"]
+    while True:
+        await asyncio.sleep(options.publish_interval)
+        for dataset in app["datasets"].values():
+            dataset.publish(app["rng"])
+        _LOGGER.debug("Published new availability")
+
+
+async def start_publisher(app):
+    """Start the publisher with the server."""
+    if app["options"].publish_interval:
+        app["publisher"] = asyncio.create_task(publish_updates(app))
+    yield
+    if "publisher" in app:
+        app["publisher"].cancel()
+    if app["stats"]:
+        _LOGGER.info(
+            "📊 Responses by status: %s",
+            ", ".join(f"{status}: {count}" for status, count in sorted(app["stats"].items())),
+        )
+
+
+def create_app(options=None):
+    """Create the stand-in server application."""
+    options = options or ServerOptions()
+    rng = random.Random(options.seed)
+    app = web.Application(middlewares=[inject_faults])
+    app["options"] = options
+    app["rng"] = rng
+    app["datasets"] = load_datasets(options, rng)
+    app["stats"] = Counter()
+    app.router.add_get(RECORDS_PATH, handle_records)
+    app.cleanup_ctx.append(start_publisher)
+    return app
+
+
+def main():
+    """Run the stand-in server."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--parkings", type=int, help="generate this many parkings per dataset")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency in seconds")
+    parser.add_argument("--error-404", type=float, default=0.0, help="share of 404 responses")
+    parser.add_argument("--error-500", type=float, default=0.0, help="share of 500 responses")
+    parser.add_argument("--truncate", type=float, default=0.0, help="share of truncated bodies")
+    parser.add_argument("--publish-interval", type=float, help="seconds between data updates")
+    parser.add_argument("--no-etag", action="store_true", help="disable ETag/Last-Modified and 304s")
+    parser.add_argument("--seed", type=int, help="seed of the generated data and injected faults")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    if args.verbose:
+        _LOGGER.setLevel(logging.DEBUG)
+    options = ServerOptions(
+        parkings=args.parkings,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_404=args.error_404,
+        error_500=args.error_500,
+        truncate=args.truncate,
+        publish_interval=args.publish_interval,
+        etag=not args.no_etag,
+        seed=args.seed,
+    )
+    _LOGGER.info(
+        "🚀 Serving %s at http://%s:%d/api/explore",
+        ", ".join(DATASETS), args.host, args.port,
+    )
+    web.run_app(create_app(options), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ sys.path.insert(
 )
 
 from config_flow import get_available_parkings
-from sensor import ParkingGentCoordinator
+from coordinator import ParkingGentCoordinator
 
 # Set up logging to see debug messages
 logging.basicConfig(level=logging.DEBUG)
@@ -92,8 +92,8 @@ async def test_selective_coordinator():
         if data:
             _LOGGER.info(f"✅ Got data for {len(data)} selected parking locations:")
             for parking_id, parking_info in data.items():
-                spaces = parking_info.get('availableCapacity', 'N/A')
-                total = parking_info.get('totalCapacity', 'N/A')
+                spaces = parking_info.available_capacity
+                total = parking_info.total_capacity
                 _LOGGER.info(f"  🚗 {parking_id}: {spaces}/{total} spaces")
             
             # Verify we only got selected parkings
@@ -0,0 +1,132 @@
+"""Test the paging and conditional requests against the local stand-in server.
+
+The ETag and Last-Modified of a records page only cover that page, so a
+source spread over several pages must be fetched in full on every poll,
+while a single page is revalidated with a conditional request.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add the repository root to the path so the integration imports as a package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+
+from custom_components.parking_gent import constants
+from custom_components.parking_gent.coordinator import ParkingGentCoordinator
+from ods_server import CAPACITY_FIELDS, DATASETS, ServerOptions, create_app
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
+
+GARAGES = DATASETS[0]
+AVAILABLE_FIELD, _ = CAPACITY_FIELDS[GARAGES]
+
+
+async def start_server(options):
+    """Start the stand-in server on a free port and point the integration at it."""
+    app = create_app(options)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    constants.BASE_API_URL = f"http://127.0.0.1:{port}/api/explore"
+    return app, runner
+
+
+async def refresh(coordinator, times=1):
+    """Run refreshes and return the data of the last one."""
+    for _ in range(times):
+        coordinator.data = await coordinator._async_update_data()
+    return coordinator.data
+
+
+async def check_paged_changes_are_fetched():
+    """A change on a later page is picked up while the first page is unchanged."""
+    _LOGGER.info("📄 Testing a source of several pages...")
+    app, runner = await start_server(ServerOptions(parkings=250, seed=1))
+    hass = HomeAssistant(tempfile.mkdtemp())
+    try:
+        coordinator = ParkingGentCoordinator(hass, store=None)
+        # The metadata request, then a poll that would keep its validators
+        data = await refresh(coordinator, 2)
+        if len(data) != 250:
+            _LOGGER.error(f"❌ Expected 250 parkings, got {len(data)}")
+            return False
+
+        record = app["datasets"][GARAGES].records[220]
+        record[AVAILABLE_FIELD] = 0 if record[AVAILABLE_FIELD] else 1
+        expected = record[AVAILABLE_FIELD]
+        data = await refresh(coordinator)
+
+        actual = data[record["name"]].available_capacity
+        if actual != expected:
+            _LOGGER.error(f"❌ {record['name']} has {actual} available spaces, the server {expected}")
+            return False
+        _LOGGER.info("✅ Change on page 3 picked up")
+        return True
+    finally:
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+
+
+async def check_single_page_is_revalidated():
+    """An unchanged single page is answered with 304 Not Modified."""
+    _LOGGER.info("📄 Testing a source of a single page...")
+    app, runner = await start_server(ServerOptions(seed=1))
+    hass = HomeAssistant(tempfile.mkdtemp())
+    try:
+        coordinator = ParkingGentCoordinator(hass, store=None)
+        await refresh(coordinator, 3)
+        if not coordinator.fetch_stats["not_modified"]:
+            _LOGGER.error(f"❌ Unchanged page was downloaded again: {coordinator.fetch_stats}")
+            return False
+
+        record = app["datasets"][GARAGES].records[0]
+        record[AVAILABLE_FIELD] = 0 if record[AVAILABLE_FIELD] else 1
+        expected = record[AVAILABLE_FIELD]
+        data = await refresh(coordinator)
+
+        actual = data[record["name"]].available_capacity
+        if actual != expected:
+            _LOGGER.error(f"❌ {record['name']} has {actual} available spaces, the server {expected}")
+            return False
+        _LOGGER.info("✅ Unchanged page revalidated, changed page downloaded")
+        return True
+    finally:
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+
+
+def test_paged_changes_are_fetched():
+    """Run the check of a source of several pages, for pytest."""
+    assert asyncio.run(check_paged_changes_are_fetched())
+
+
+def test_single_page_is_revalidated():
+    """Run the check of a source of a single page, for pytest."""
+    assert asyncio.run(check_single_page_is_revalidated())
+
+
+async def main():
+    """Run all tests."""
+    logging.getLogger("ods_server").setLevel(logging.WARNING)
+    results = [
+        await check_paged_changes_are_fetched(),
+        await check_single_page_is_revalidated(),
+    ]
+    _LOGGER.info(f"📊 Test Results: {sum(results)}/{len(results)} tests passed")
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""Test refreshes of the coordinator against the local stand-in server.
+
+A refresh started while another one runs (a scheduled poll and a service
+call, say) must not lose the changes the first one found: every changed
+parking has to reach the listeners.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+
+# Add the repository root to the path so the integration imports as a package
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from aiohttp import web
+from homeassistant.core import HomeAssistant
+
+from custom_components.parking_gent import constants
+from custom_components.parking_gent.coordinator import ParkingGentCoordinator
+from ods_server import CAPACITY_FIELDS, DATASETS, ServerOptions, create_app
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
+
+GARAGES = DATASETS[0]
+AVAILABLE_FIELD, _ = CAPACITY_FIELDS[GARAGES]
+
+
+async def start_server(options):
+    """Start the stand-in server on a free port and point the integration at it."""
+    app = create_app(options)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    constants.BASE_API_URL = f"http://127.0.0.1:{port}/api/explore"
+    return app, runner
+
+
+async def check_overlapping_refreshes_keep_changes():
+    """A change found by one of two overlapping refreshes reaches the listeners."""
+    _LOGGER.info("🔁 Testing two overlapping refreshes...")
+    app, runner = await start_server(ServerOptions(seed=1))
+    hass = HomeAssistant(tempfile.mkdtemp())
+    try:
+        coordinator = ParkingGentCoordinator(hass, store=None)
+        notified = set()
+        unsubscribe = coordinator.async_add_listener(
+            lambda: notified.update(coordinator.changed_parkings)
+        )
+        await coordinator.async_refresh()
+
+        record = app["datasets"][GARAGES].records[0]
+        record[AVAILABLE_FIELD] = 0 if record[AVAILABLE_FIELD] else 1
+        expected = record[AVAILABLE_FIELD]
+        notified.clear()
+        # Start the second refresh once the first has its data, just before
+        # it hands the data over to the executor and then the listeners
+        update_histories = coordinator._update_histories
+        overlapping = []
+
+        def start_overlapping_refresh(data):
+            if not overlapping:
+                overlapping.append(hass.async_create_task(coordinator.async_refresh()))
+            return update_histories(data)
+
+        coordinator._update_histories = start_overlapping_refresh
+        await coordinator.async_refresh()
+        await asyncio.gather(*overlapping)
+        unsubscribe()
+
+        actual = coordinator.data[record["name"]].available_capacity
+        if actual != expected:
+            _LOGGER.error(f"❌ {record['name']} has {actual} available spaces, the server {expected}")
+            return False
+        if record["name"] not in notified:
+            _LOGGER.error(f"❌ The change of {record['name']} never reached the listeners")
+            return False
+        _LOGGER.info("✅ Change passed on to the listeners")
+        return True
+    finally:
+        await hass.async_stop(force=True)
+        await runner.cleanup()
+
+
+def test_overlapping_refreshes_keep_changes():
+    """Run the check of overlapping refreshes, for pytest."""
+    assert asyncio.run(check_overlapping_refreshes_keep_changes())
+
+
+async def main():
+    """Run all tests."""
+    logging.getLogger("ods_server").setLevel(logging.WARNING)
+    results = [
+        await check_overlapping_refreshes_keep_changes(),
+    ]
+    _LOGGER.info(f"📊 Test Results: {sum(results)}/{len(results)} tests passed")
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -13,7 +13,7 @@ sys.path.insert(
     ),
 )
 
-from sensor import ParkingGentCoordinator
+from coordinator import ParkingGentCoordinator
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -45,7 +45,7 @@ async def test_coordinator_robustness():
         if data:
             _LOGGER.info(f"SUCCESS: Got data for {len(data)} parking locations:")
             for parking_id, parking_info in data.items():
-                _LOGGER.info(f"  - {parking_id}: {parking_info.get('availableCapacity', 'N/A')} spaces available")
+                _LOGGER.info(f"  - {parking_id}: {parking_info.available_capacity} spaces available")
             
             # Check if we have parking garage data
             garage_found = any("garage" in str(parking_info).lower() or 